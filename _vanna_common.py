@@ -0,0 +1,62 @@
+import re
+
+
+# Shared by vanna_flask_app and vanna_local_demo: table choice, view naming and training examples
+
+_SNAKE_NONALNUM = re.compile(r"[^a-z0-9]+")
+_SNAKE_DUP = re.compile(r"_+")
+
+
+def to_snake_case(name: str) -> str:
+	return _SNAKE_DUP.sub("_", _SNAKE_NONALNUM.sub("_", name.strip().lower())).strip("_") or "col"
+
+
+def pick_uber_table(available: set[str], preferred: str | None = None) -> str | None:
+	if preferred and preferred in available:
+		return preferred
+	if "ncr_ride_bookings" in available:
+		return "ncr_ride_bookings"
+	if "uber_rides" in available:
+		return "uber_rides"
+	# Fallback: first table containing 'ride' or 'uber'
+	matches = [t for t in available if ("ride" in t.lower() or "uber" in t.lower())]
+	return matches[0] if matches else None
+
+
+# information_schema data_type -> type used in the training DDL; anything else is text
+_TYPE_MAP = {
+	"double precision": "double precision",
+	"numeric": "double precision",
+	"real": "double precision",
+	"integer": "integer",
+	"bigint": "integer",
+	"smallint": "integer",
+	"date": "date",
+	"timestamp without time zone": "timestamp without time zone",
+	"timestamp with time zone": "timestamp with time zone",
+}
+
+
+def build_view_ddl(ddl_cols) -> str:
+	lines = [f"\t\t{col_name} {_TYPE_MAP.get(data_type, 'text')}" for col_name, data_type in ddl_cols]
+	return "CREATE TABLE uber_bookings (\n" + ",\n".join(lines) + "\n\t)"
+
+
+# Uber-specific question/SQL pairs trained alongside the view DDL so Vanna prefers Uber data
+TRAINING_EXAMPLES = [
+	{"question": "How many total rides are there?", "sql": "SELECT COUNT(*) AS total_rides FROM uber_bookings;"},
+	{"question": "How many completed rides by day?", "sql": (
+		"SELECT date::date AS ride_date, COUNT(*) AS completed_rides "
+		"FROM uber_bookings WHERE lower(booking_status) = 'completed' "
+		"GROUP BY date::date ORDER BY ride_date;"
+	)},
+	{"question": "What is the average ride distance per vehicle type?", "sql": (
+		"SELECT vehicle_type, AVG(ride_distance) AS avg_distance FROM uber_bookings GROUP BY vehicle_type ORDER BY avg_distance DESC;"
+	)},
+	{"question": "Top 10 pickup locations by rides", "sql": (
+		"SELECT pickup_location, COUNT(*) AS rides FROM uber_bookings GROUP BY pickup_location ORDER BY rides DESC LIMIT 10;"
+	)},
+	{"question": "Total booking value (revenue)?", "sql": (
+		"SELECT SUM(booking_value) AS total_booking_value FROM uber_bookings;"
+	)},
+]
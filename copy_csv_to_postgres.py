@@ -1,7 +1,11 @@
 import argparse
 import csv
+import mmap
 import os
+import re
+import socket
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
 
 
@@ -12,9 +16,96 @@ def read_csv_header(csv_path: str) -> list[str]:
 		return headers
 
 
+def infer_column_types(csv_path: str, delimiter: str, quote: str, null_token: str) -> list[str]:
+	"""Infer PostgreSQL column types from the first block of the CSV using PyArrow"""
+	import pyarrow as pa
+	import pyarrow.csv as pacsv
+
+	reader = pacsv.open_csv(
+		csv_path,
+		read_options=pacsv.ReadOptions(block_size=4 << 20),
+		parse_options=pacsv.ParseOptions(delimiter=delimiter, quote_char=quote),
+		# Same NULL rule as the COPY: only the null token, so a column with empty fields stays TEXT
+		convert_options=pacsv.ConvertOptions(null_values=[null_token], strings_can_be_null=True),
+	)
+	pg_types = []
+	for field in reader.schema:
+		t = field.type
+		if pa.types.is_integer(t):
+			pg_types.append("BIGINT")
+		elif pa.types.is_floating(t):
+			pg_types.append("DOUBLE PRECISION")
+		elif pa.types.is_boolean(t):
+			pg_types.append("BOOLEAN")
+		elif pa.types.is_timestamp(t):
+			pg_types.append("TIMESTAMPTZ" if t.tz else "TIMESTAMP")
+		elif pa.types.is_date(t):
+			pg_types.append("DATE")
+		elif pa.types.is_time(t):
+			pg_types.append("TIME")
+		else:
+			pg_types.append("TEXT")
+	reader.close()
+	return pg_types
+
+
+_QUOTE_TRANS = str.maketrans({'"': '""'})
+
+
 def quote_ident(identifier: str) -> str:
 	# Escape embedded quotes and wrap in double-quotes for PostgreSQL identifiers
-	return '"' + identifier.replace('"', '""') + '"'
+	return '"' + identifier.translate(_QUOTE_TRANS) + '"'
+
+
+def tune_socket(conn) -> None:
+	"""Grow the send buffer and disable Nagle on the libpq TCP socket for COPY streaming"""
+	# Work on a dup of libpq's fd; options apply to the shared underlying socket
+	sock = socket.socket(fileno=os.dup(conn.fileno()))
+	try:
+		if sock.family in (socket.AF_INET, socket.AF_INET6):
+			sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 << 20)
+			sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+	except OSError:
+		pass  # option not supported on this platform
+	finally:
+		sock.close()
+
+
+def drop_secondary_indexes(cur, qualified_table: str) -> list[str]:
+	"""Drop indexes not backing a constraint and return their definitions for rebuild"""
+	cur.execute(
+		"""
+		SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+		FROM pg_index i
+		WHERE i.indrelid = %s::regclass
+		  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+		""",
+		(qualified_table,),
+	)
+	indexes = cur.fetchall()
+	for index_name, _ in indexes:
+		cur.execute(f"DROP INDEX {index_name};")
+	return [index_def for _, index_def in indexes]
+
+
+def rebuild_indexes(index_defs: list[str], connect) -> None:
+	"""Recreate indexes CONCURRENTLY, one connection per index"""
+	def build(index_def):
+		sql = re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX CONCURRENTLY ", index_def)
+		conn = connect()
+		conn.autocommit = True  # CONCURRENTLY cannot run inside a transaction block
+		try:
+			with conn.cursor() as cur:
+				cur.execute(sql)
+			print(f"Rebuilt index: {sql}")
+		except Exception:
+			print(f"Failed to rebuild index, recreate manually: {index_def}", file=sys.stderr)
+			raise
+		finally:
+			conn.close()
+
+	with ThreadPoolExecutor(max_workers=max(len(index_defs), 1)) as pool:
+		list(pool.map(build, index_defs))
 
 
 def main() -> None:
@@ -31,7 +122,11 @@ def main() -> None:
 	parser.add_argument("--quote", default='"')
 	parser.add_argument("--null-token", dest="null_token", default="null", help="String token in CSV to treat as SQL NULL (default: 'null')")
 	parser.add_argument("--create-table", action="store_true", help="Create table (all TEXT columns) from CSV header if not exists")
+	parser.add_argument("--infer-types", dest="infer_types", action="store_true", help="With --create-table, infer typed columns from the first 4 MiB instead of all TEXT (falls back to TEXT if later rows don't fit)")
 	parser.add_argument("--truncate", action="store_true", help="TRUNCATE the table before load (keeps dependent views)")
+	parser.add_argument("--unlogged", action="store_true", help="Switch the table to UNLOGGED for the load and back to LOGGED afterwards")
+	parser.add_argument("--rebuild-indexes", dest="rebuild_indexes", action="store_true", help="Drop non-constraint indexes before COPY and rebuild them CONCURRENTLY afterwards")
+	parser.add_argument("--workers", type=int, default=1, help="Parallel COPY connections; >1 splits the file on newlines and commits each slice separately (default: 1)")
 	args = parser.parse_args()
 
 	csv_path = args.csv
@@ -41,50 +136,116 @@ def main() -> None:
 
 	headers = read_csv_header(csv_path)
 	qualified_table = f"{quote_ident(args.schema)}.{quote_ident(args.table)}"
-	column_list_sql = ", ".join(quote_ident(h) for h in headers)
-
-	conn = psycopg2.connect(
-		host=args.host,
-		port=args.port,
-		dbname=args.dbname,
-		user=args.user,
-		password=args.password,
-	)
+	# Quote every header once; reused by CREATE TABLE and COPY
+	quoted_headers = [quote_ident(h) for h in headers]
+	column_list_sql = ", ".join(quoted_headers)
+
+	def connect():
+		# Bulk-load session settings: don't wait for WAL flush on commit and give
+		# index/constraint maintenance more memory
+		new_conn = psycopg2.connect(
+			host=args.host,
+			port=args.port,
+			dbname=args.dbname,
+			user=args.user,
+			password=args.password,
+			options="-c synchronous_commit=off -c maintenance_work_mem=1GB",
+		)
+		tune_socket(new_conn)
+		return new_conn
+
+	conn = connect()
 	conn.autocommit = False
+	index_defs = []
+
+	def load(cur, col_types) -> int:
+		"""Create (when col_types is given), prepare and COPY the table; return its row count"""
+		nonlocal index_defs
+		# Optionally create table using exact header names
+		if col_types is not None:
+			cols_sql = ", ".join(f"{h} {t}" for h, t in zip(quoted_headers, col_types))
+			cur.execute(f"CREATE SCHEMA IF NOT EXISTS {quote_ident(args.schema)};")
+			cur.execute(
+				f"CREATE TABLE IF NOT EXISTS {qualified_table} ({cols_sql});"
+			)
 
-	try:
-		with conn.cursor() as cur:
-			# Optionally create table with TEXT columns using exact header names
-			if args.create_table:
-				cols_sql = ", ".join(f"{quote_ident(h)} TEXT" for h in headers)
-				cur.execute(f"CREATE SCHEMA IF NOT EXISTS {quote_ident(args.schema)};")
-				cur.execute(
-					f"CREATE TABLE IF NOT EXISTS {qualified_table} ({cols_sql});"
-				)
+		# Optional truncate to avoid DROP when views depend on the table
+		if args.truncate:
+			cur.execute(f"TRUNCATE TABLE {qualified_table};")
+
+		# Skip WAL for the table contents while loading
+		if args.unlogged:
+			cur.execute(f"ALTER TABLE {qualified_table} SET UNLOGGED;")
+
+		# Bulk index builds after the load beat per-row index maintenance during COPY;
+		# the DROP is transactional, so a failed load restores the indexes
+		if args.rebuild_indexes:
+			index_defs = drop_secondary_indexes(cur, qualified_table)
+
+		copy_options = f"DELIMITER '{args.delimiter}', QUOTE '{args.quote}', NULL '{args.null_token}'"
+		if args.workers > 1:
+			# Workers need to see the table/truncate, so commit the setup first
+			conn.commit()
+			from src.csv_importer import parallel_copy
+			copy_sql = f"COPY {qualified_table} ({column_list_sql}) FROM STDIN WITH (FORMAT csv, HEADER false, {copy_options})"
+			parallel_copy(csv_path, copy_sql, connect, workers=args.workers)
+		else:
+			# COPY with CSV HEADER, explicit delimiter/quote
+			copy_sql = f"COPY {qualified_table} ({column_list_sql}) FROM STDIN WITH (FORMAT csv, HEADER true, {copy_options})"
+			# Hand psycopg2 slices of a read-only mapping: no text decode/re-encode
+			with open(csv_path, mode='rb') as f:
+				if os.fstat(f.fileno()).st_size:
+					with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+						cur.copy_expert(sql=copy_sql, file=mm, size=1 << 20)
 
-			# Optional truncate to avoid DROP when views depend on the table
-			if args.truncate:
-				cur.execute(f"TRUNCATE TABLE {qualified_table};")
+		if args.unlogged:
+			cur.execute(f"ALTER TABLE {qualified_table} SET LOGGED;")
 
-			# COPY with CSV HEADER, explicit delimiter/quote
-			copy_sql = (
-				f"COPY {qualified_table} ({column_list_sql}) FROM STDIN WITH (FORMAT csv, HEADER true, DELIMITER '{args.delimiter}', QUOTE '{args.quote}', NULL '{args.null_token}')"
-			)
-			with open(csv_path, mode='r', encoding='utf-8', newline='') as f:
-				cur.copy_expert(sql=copy_sql, file=f)
+		# Row count from fresh planner stats instead of a full COUNT(*) scan
+		cur.execute(f"ANALYZE {qualified_table};")
+		cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;", (qualified_table,))
+		return max(cur.fetchone()[0], 0)
 
-			# Row count
-			cur.execute(f"SELECT COUNT(*) FROM {qualified_table};")
-			row_count = cur.fetchone()[0]
+	try:
+		with conn.cursor() as cur:
+			col_types = None
+			created = False
+			if args.create_table:
+				cur.execute("SELECT to_regclass(%s) IS NULL;", (qualified_table,))
+				created = cur.fetchone()[0]
+				if args.infer_types:
+					col_types = infer_column_types(csv_path, args.delimiter, args.quote, args.null_token)
+				else:
+					col_types = ["TEXT"] * len(headers)
+
+			try:
+				row_count = load(cur, col_types)
+			except psycopg2.DataError as e:
+				# Types are inferred from the first block only; later rows may not fit them
+				if not (created and args.infer_types):
+					raise
+				print(f"Inferred column types did not fit the data ({str(e).splitlines()[0]}); reloading with TEXT columns", file=sys.stderr)
+				conn.rollback()
+				if args.workers > 1:
+					# The table was committed before the parallel COPY and some slices may have landed
+					cur.execute(f"DROP TABLE IF EXISTS {qualified_table};")
+					conn.commit()
+				row_count = load(cur, ["TEXT"] * len(headers))
 			print(f"Loaded {row_count} rows into {args.schema}.{args.table}")
 
 		conn.commit()
 	except Exception as e:
 		conn.rollback()
+		# With --workers the DROP was already committed, so restore the indexes
+		if index_defs and args.workers > 1:
+			rebuild_indexes(index_defs, connect)
 		raise
 	finally:
 		conn.close()
 
+	if index_defs:
+		rebuild_indexes(index_defs, connect)
+
 
 if __name__ == "__main__":
 	main()
@@ -3,85 +3,115 @@
 Simple demonstration of loading data into PostgreSQL
 """
 
-import subprocess
+import os
+import psycopg2
 
-def run_command(command):
-    """Run a command and return output"""
-    try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        return result.returncode == 0, result.stdout, result.stderr
-    except Exception as e:
-        return False, "", str(e)
+def format_rows(columns, rows):
+    """Format query results as a simple aligned text table"""
+    cells = [[str(v) for v in row] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    lines = [" | ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("-+-".join("-" * w for w in widths))
+    lines.extend(" | ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells)
+    lines.append(f"({len(cells)} rows)")
+    return "\n".join(lines)
+
+def run_query(cur, sql):
+    """Run a query on the shared cursor and return it formatted"""
+    cur.execute(sql)
+    return format_rows([d[0] for d in cur.description], cur.fetchall())
 
 def main():
     print("🗄️ PostgreSQL Data Loading Demonstration")
     print("=" * 50)
-    
+
     print("📊 Step 1: Check PostgreSQL connection")
-    success, stdout, stderr = run_command("docker-compose exec -T db psql -U mcpuser -d mcpdb -c \"SELECT 'PostgreSQL is running!' as status;\"")
-    if success:
-        print(f"✅ {stdout.strip()}")
-    else:
-        print(f"❌ PostgreSQL connection failed: {stderr}")
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv("PGHOST", "localhost"),
+            port=int(os.getenv("PGPORT", "5432")),
+            dbname=os.getenv("PGDATABASE", "mcpdb"),
+            user=os.getenv("PGUSER", "mcpuser"),
+            password=os.getenv("PGPASSWORD", "mcppass"),
+        )
+    except Exception as e:
+        print(f"❌ PostgreSQL connection failed: {e}")
         return
-    
-    print("\n📋 Step 2: List current tables")
-    success, stdout, stderr = run_command("docker-compose exec -T db psql -U mcpuser -d mcpdb -c \"\\dt\"")
-    if success:
-        print(f"📊 Current tables:\n{stdout}")
-    else:
-        print(f"❌ Failed to list tables: {stderr}")
-    
-    print("\n📝 Step 3: Create sample data in PostgreSQL")
-    create_table_sql = """
-    CREATE TABLE IF NOT EXISTS demo_data (
-        id SERIAL PRIMARY KEY,
-        name VARCHAR(100),
-        age INTEGER,
-        city VARCHAR(50),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-    """
-    
-    success, stdout, stderr = run_command(f"docker-compose exec -T db psql -U mcpuser -d mcpdb -c \"{create_table_sql}\"")
-    if success:
-        print("✅ Sample table created")
-    else:
-        print(f"❌ Failed to create table: {stderr}")
-    
-    print("\n📊 Step 4: Insert sample data")
-    insert_sql = """
-    INSERT INTO demo_data (name, age, city) VALUES 
-    ('Alice Johnson', 28, 'New York'),
-    ('Bob Smith', 34, 'London'),
-    ('Charlie Brown', 29, 'Paris'),
-    ('Diana Prince', 31, 'Tokyo'),
-    ('Eve Wilson', 26, 'Sydney');
-    """
-    
-    success, stdout, stderr = run_command(f"docker-compose exec -T db psql -U mcpuser -d mcpdb -c \"{insert_sql}\"")
-    if success:
-        print("✅ Sample data inserted")
-    else:
-        print(f"❌ Failed to insert data: {stderr}")
-    
-    print("\n📈 Step 5: Query the data")
-    success, stdout, stderr = run_command("docker-compose exec -T db psql -U mcpuser -d mcpdb -c \"SELECT * FROM demo_data;\"")
-    if success:
-        print(f"📊 Data in PostgreSQL:\n{stdout}")
-    else:
-        print(f"❌ Failed to query data: {stderr}")
-    
-    print("\n📋 Step 6: Show table structure")
-    success, stdout, stderr = run_command("docker-compose exec -T db psql -U mcpuser -d mcpdb -c \"\\d demo_data\"")
-    if success:
-        print(f"📝 Table structure:\n{stdout}")
-    else:
-        print(f"❌ Failed to show table structure: {stderr}")
-    
+    conn.autocommit = True
+
+    try:
+        with conn.cursor() as cur:
+            status = run_query(cur, "SELECT 'PostgreSQL is running!' as status;")
+            print(f"✅ {status}")
+
+            print("\n📋 Step 2: List current tables")
+            try:
+                tables = run_query(cur, """
+                    SELECT table_schema AS schema, table_name AS name
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
+                    ORDER BY table_name;
+                """)
+                print(f"📊 Current tables:\n{tables}")
+            except Exception as e:
+                print(f"❌ Failed to list tables: {e}")
+
+            print("\n📝 Step 3: Create sample data in PostgreSQL")
+            create_table_sql = """
+            CREATE TABLE IF NOT EXISTS demo_data (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(100),
+                age INTEGER,
+                city VARCHAR(50),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """
+
+            try:
+                cur.execute(create_table_sql)
+                print("✅ Sample table created")
+            except Exception as e:
+                print(f"❌ Failed to create table: {e}")
+
+            print("\n📊 Step 4: Insert sample data")
+            insert_sql = """
+            INSERT INTO demo_data (name, age, city) VALUES
+            ('Alice Johnson', 28, 'New York'),
+            ('Bob Smith', 34, 'London'),
+            ('Charlie Brown', 29, 'Paris'),
+            ('Diana Prince', 31, 'Tokyo'),
+            ('Eve Wilson', 26, 'Sydney');
+            """
+
+            try:
+                cur.execute(insert_sql)
+                print("✅ Sample data inserted")
+            except Exception as e:
+                print(f"❌ Failed to insert data: {e}")
+
+            print("\n📈 Step 5: Query the data")
+            try:
+                print(f"📊 Data in PostgreSQL:\n{run_query(cur, 'SELECT * FROM demo_data;')}")
+            except Exception as e:
+                print(f"❌ Failed to query data: {e}")
+
+            print("\n📋 Step 6: Show table structure")
+            try:
+                structure = run_query(cur, """
+                    SELECT column_name AS "Column", data_type AS "Type",
+                           is_nullable AS "Nullable", column_default AS "Default"
+                    FROM information_schema.columns
+                    WHERE table_schema = 'public' AND table_name = 'demo_data'
+                    ORDER BY ordinal_position;
+                """)
+                print(f"📝 Table structure:\n{structure}")
+            except Exception as e:
+                print(f"❌ Failed to show table structure: {e}")
+    finally:
+        conn.close()
+
     print("\n🎉 Demonstration Complete!")
     print("Your MCP server works the same way - it loads CSV data into PostgreSQL tables!")
 
 if __name__ == "__main__":
     main()
-
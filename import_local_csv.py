@@ -1,20 +1,8 @@
 import os
 import argparse
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
 
-from src.csv_importer import CSVImporter
-
-
-def sanitize_table_name(filename: str) -> str:
-	base = os.path.splitext(os.path.basename(filename))[0]
-	return (
-		base.replace("-", "_")
-		.replace(" ", "_")
-		.replace("/", "_")
-		.replace(".", "_")
-		.lower()
-	)
+from src.csv_importer import CSVImporter, sanitize_table_name
 
 
 def main() -> None:
@@ -42,16 +30,13 @@ def main() -> None:
 	print(f"  DB:    {database_url}")
 
 	importer = CSVImporter(database_url=database_url)
-	engine = create_engine(database_url)
 
 	# Import using TRUNCATE+append behavior if table exists (handled inside CSVImporter)
 	msg = importer.create_table_from_csv(csv_path, table_name)
 	print(msg)
 
 	# Report row count
-	with engine.connect() as conn:
-		result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-		row_count = result.scalar() or 0
+	row_count = importer.estimated_row_count(table_name)
 	print(f"Row count in {table_name}: {row_count}")
 
 	print("Done.")
@@ -1,20 +1,8 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
 
 from src.kaggle_downloader import KaggleDownloader
-from src.csv_importer import CSVImporter
-
-
-def sanitize_table_name(filename: str) -> str:
-    base = os.path.splitext(os.path.basename(filename))[0]
-    return (
-        base.replace("-", "_")
-        .replace(" ", "_")
-        .replace("/", "_")
-        .replace(".", "_")
-        .lower()
-    )
+from src.csv_importer import CSVImporter, sanitize_table_name
 
 
 def main() -> None:
@@ -46,7 +34,6 @@ def main() -> None:
     print(f"Found {len(csv_paths)} CSV file(s) in cache at {result.get('download_path')}")
 
     importer = CSVImporter(database_url=database_url)
-    engine = create_engine(database_url)
 
     created_tables = []
     for csv_path in csv_paths:
@@ -54,13 +41,11 @@ def main() -> None:
         print(f"\nImporting: {csv_path} -> table: {table_name}")
         msg = importer.create_table_from_csv(csv_path, table_name)
         print(msg)
-        with engine.connect() as conn:
-            try:
-                count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                row_count = count.scalar()
-                print(f"Row count in {table_name}: {row_count}")
-            except Exception as e:
-                print(f"Failed to count rows in {table_name}: {e}")
+        try:
+            row_count = importer.estimated_row_count(table_name)
+            print(f"Row count in {table_name}: {row_count}")
+        except Exception as e:
+            print(f"Failed to count rows in {table_name}: {e}")
         created_tables.append(table_name)
 
     # Suggest one to use
@@ -1,36 +1,288 @@
-import pandas as pd
+import psycopg2
+import csv
+import datetime
+import io
+import itertools
+import mmap
 import os
-from sqlalchemy import create_engine, text, inspect
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from sqlalchemy import text, inspect
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    from models import get_database_engine
+except ImportError:  # imported as src.csv_importer from the repo root
+    from src.models import get_database_engine
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bytes compared per NumPy pass when counting newlines
+LINE_COUNT_WINDOW_BYTES = 64 << 20
+
+# Rows sampled to infer column types and the NULL marker before COPY
+TYPE_SAMPLE_ROWS = 10000
+
+# Rows per pandas chunk when a CSV is parsed client-side before COPY
+CSV_CHUNK_ROWS = 200000
+
+# Block size for PyArrow's multi-threaded CSV reader
+ARROW_BLOCK_SIZE = 32 << 20
+
+# Flush binary COPY buffers once they grow past this size
+BINARY_COPY_CHUNK_BYTES = 64 << 20
+
+# PostgreSQL binary COPY framing: signature + flags + header extension length, and the trailer
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\0" + struct.pack("!ii", 0, 0)
+PGCOPY_TRAILER = struct.pack("!h", -1)
+
+# Microseconds between the Unix epoch and the PostgreSQL epoch (2000-01-01)
+PG_EPOCH_OFFSET_US = 946684800 * 1000000
+
+# PostgreSQL's DATE epoch, for binary date fields (days since 2000-01-01)
+PG_EPOCH_DATE = datetime.date(2000, 1, 1)
+
+# Literal NULL markers that pandas would have treated as missing values
+NULL_TOKENS = ("null", "NULL", "NaN", "NA", "N/A", "None")
+
+# NULL marker for DataFrame text COPY (PostgreSQL's own default for the text format)
+NULL_SENTINEL = "\\N"
+
+# Rows fetched per server-side cursor round-trip when reading a table back
+QUERY_BATCH_ROWS = 1000
+
+# Existence + columns in one catalog query (to_regclass is NULL for unknown tables);
+# shared with the async introspection tools in server.py
+TABLE_COLUMNS_SQL = """
+    SELECT attname, format_type(atttypid, atttypmod), NOT attnotnull
+    FROM pg_attribute
+    WHERE attrelid = to_regclass(:t) AND attnum > 0 AND NOT attisdropped
+    ORDER BY attnum
+"""
+
+# Planner row estimate from the last ANALYZE/VACUUM; -1 when the table was never analyzed
+TABLE_ROW_ESTIMATE_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"
+
+
+# One-pass translation for table names: separators become "_", ASCII upper becomes lower
+_TABLE_NAME_TRANS = str.maketrans({
+    "-": "_", " ": "_", "/": "_", ".": "_",
+    **{chr(c): chr(c + 32) for c in range(ord("A"), ord("Z") + 1)},
+})
+
+
+def sanitize_table_name(filename: str) -> str:
+    """Derive a lowercase, underscore-separated table name from a file path"""
+    return os.path.splitext(os.path.basename(filename))[0].translate(_TABLE_NAME_TRANS)
+
+
+def _lazy_pd():
+    """Import pandas on first use so metadata-only calls skip its import cost"""
+    import pandas
+    return pandas
+
+
+def _infer_sample_type(values: list) -> str:
+    """Guess a pandas-style dtype name for a column from a few raw string values"""
+    values = [v for v in values if v != "" and v not in NULL_TOKENS]
+    if not values:
+        return "object"
+    for cast, name in ((int, "int64"), (float, "float64")):
+        try:
+            for v in values:
+                cast(v)
+            return name
+        except ValueError:
+            continue
+    return "object"
+
+
+_QUOTE_TRANS = str.maketrans({'"': '""'})
+
+
+def quote_ident(identifier: str) -> str:
+    """Escape embedded quotes and wrap in double-quotes for PostgreSQL identifiers"""
+    return '"' + identifier.translate(_QUOTE_TRANS) + '"'
+
+
+def table_row_count_sql(table_name: str, exact: bool = False) -> str:
+    """One statement returning (row_count, row_count_exact), bound with :t = quote_ident(table_name).
+
+    Uses the pg_class.reltuples estimate, falling back to COUNT(*) when exact=True or the
+    table was never analyzed (-1). The COUNT(*) is an InitPlan, so it only runs when needed.
+    """
+    count = f"(SELECT COUNT(*) FROM {quote_ident(table_name)})"
+    if exact:
+        return f"SELECT {count}, true"
+    return (
+        f"SELECT CASE WHEN e.n >= 0 THEN e.n ELSE {count} END, e.n < 0 "
+        "FROM (SELECT reltuples::bigint AS n FROM pg_class WHERE oid = to_regclass(:t)) e"
+    )
+
+
+def table_info_result(table_name: str, columns: list, count_row: tuple) -> dict:
+    """Shape TABLE_COLUMNS_SQL rows and a table_row_count_sql row into get_table_info's result"""
+    row_count, counted = count_row
+    return {
+        "table_name": table_name,
+        "row_count": row_count,
+        "row_count_exact": counted,
+        "columns": [
+            {"name": name, "type": col_type, "nullable": nullable}
+            for name, col_type, nullable in columns
+        ],
+    }
+
+
+@lru_cache(maxsize=128)
+def _column_list_sql(columns: tuple) -> str:
+    """Quoted, comma-separated column list; cached because batch loads repeat it per chunk"""
+    return ", ".join(quote_ident(str(c)) for c in columns)
+
+
+class _SliceReader:
+    """Read-only file-like view over a byte range of a memory-mapped file"""
+
+    def __init__(self, mm: mmap.mmap, start: int, end: int):
+        self.mm = mm
+        self.pos = start
+        self.end = end
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.end - self.pos
+        stop = min(self.pos + size, self.end)
+        data = self.mm[self.pos:stop]
+        self.pos = stop
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        nl = self.mm.find(b"\n", self.pos, self.end)
+        stop = self.end if nl == -1 else nl + 1
+        if size is not None and size >= 0:
+            stop = min(stop, self.pos + size)
+        data = self.mm[self.pos:stop]
+        self.pos = stop
+        return data
+
+
+def _newline_aligned_ranges(mm: mmap.mmap, start: int, workers: int) -> list:
+    """Split [start, len(mm)) into up to `workers` ranges that end on newlines"""
+    end = len(mm)
+    step = max((end - start) // workers, 1)
+    bounds = [start]
+    for i in range(1, workers):
+        nl = mm.find(b"\n", max(start + i * step, bounds[-1]), end)
+        if nl == -1:
+            break
+        bounds.append(nl + 1)
+    bounds.append(end)
+    return [(s, e) for s, e in zip(bounds, bounds[1:]) if s < e]
+
+
+def parallel_copy(csv_path: str, copy_sql: str, connect, workers: int = 4, skip_header: bool = True) -> None:
+    """Run COPY over newline-aligned slices of a CSV on `workers` connections at once.
+
+    `copy_sql` must read headerless input (HEADER false); the header line is
+    skipped here. `connect` returns a new DB-API connection per worker. Slices
+    commit independently, so a failed worker leaves the others' rows loaded.
+    Splitting on raw newlines assumes no quoted field contains a line break.
+    """
+    with open(csv_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            if skip_header:
+                nl = mm.find(b"\n")
+                start = len(mm) if nl == -1 else nl + 1
+            ranges = _newline_aligned_ranges(mm, start, workers)
+
+            def copy_range(byte_range):
+                conn = connect()
+                try:
+                    cur = conn.cursor()
+                    cur.copy_expert(copy_sql, _SliceReader(mm, *byte_range), size=1 << 20)
+                    cur.close()
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+
+            with ThreadPoolExecutor(max_workers=max(len(ranges), 1)) as pool:
+                # list() re-raises the first worker failure
+                list(pool.map(copy_range, ranges))
+
+
 class CSVImporter:
     def __init__(self, database_url: str = None):
         self.database_url = database_url or os.getenv("DATABASE_URL")
         if not self.database_url:
             raise ValueError("DATABASE_URL not provided")
         
-        self.engine = create_engine(self.database_url)
+        self.engine = get_database_engine(self.database_url)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self._row_count_cache = {}
+    
+    @staticmethod
+    def _fast_line_count(csv_path: str) -> int:
+        """Count lines in the file with a vectorized byte scan over a memory map"""
+        import numpy as np
+        with open(csv_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0
+            count = 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Windowed so the comparison mask stays bounded on multi-GiB files
+                for offset in range(0, size, LINE_COUNT_WINDOW_BYTES):
+                    window = np.frombuffer(mm, dtype=np.uint8, count=min(LINE_COUNT_WINDOW_BYTES, size - offset), offset=offset)
+                    count += int(np.count_nonzero(window == 0x0A))
+                    del window  # release the buffer export before the map closes
+                last = mm[size - 1:size]
+        # A final line without a trailing newline still counts
+        if last != b'\n':
+            count += 1
+        return count
+    
+    def _count_data_rows(self, csv_path: str) -> int:
+        """Return the number of data rows (excluding header), cached per file version"""
+        st = os.stat(csv_path)
+        key = (os.path.abspath(csv_path), st.st_mtime, st.st_size)
+        if key not in self._row_count_cache:
+            self._row_count_cache[key] = max(self._fast_line_count(csv_path) - 1, 0)
+        return self._row_count_cache[key]
     
     def analyze_csv(self, csv_path: str) -> dict:
         """Analyze CSV file structure and return metadata"""
         try:
-            # Read first few rows to analyze structure
-            df_sample = pd.read_csv(csv_path, nrows=5)
+            # Read first few rows to analyze structure (plain csv module, no pandas import)
+            with open(csv_path, mode='r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                columns = next(reader, [])
+                sample_rows = list(itertools.islice(reader, 5))
             
             analysis = {
                 "file_path": csv_path,
-                "total_rows": len(pd.read_csv(csv_path)),
-                "columns": list(df_sample.columns),
-                "column_types": df_sample.dtypes.to_dict(),
-                "sample_data": df_sample.head(3).to_dict('records'),
+                "total_rows": self._count_data_rows(csv_path),
+                "columns": columns,
+                "column_types": {
+                    col: _infer_sample_type([row[i] for row in sample_rows if i < len(row)])
+                    for i, col in enumerate(columns)
+                },
+                "sample_data": [dict(zip(columns, row)) for row in sample_rows[:3]],
                 "file_size_mb": os.path.getsize(csv_path) / (1024 * 1024)
             }
             
@@ -41,37 +293,101 @@ class CSVImporter:
             logger.error(f"Error analyzing CSV: {e}")
             raise
     
-    def create_table_from_csv(self, csv_path: str, table_name: str = "csv_data") -> str:
-        """Create a table based on CSV structure and import data"""
+    def _copy_in_transaction(self, table_name: str, truncate: bool, load) -> None:
+        """Run `load(cursor)` on one raw connection, optionally truncating first, and commit"""
+        raw_conn = self.engine.raw_connection()
         try:
-            # Read CSV
-            df = pd.read_csv(csv_path)
+            cur = raw_conn.cursor()
+            # TRUNCATE (not DROP) keeps dependent views intact
+            if truncate:
+                cur.execute(f"TRUNCATE TABLE {quote_ident(table_name)};")
+            load(cur)
+            cur.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+    
+    @staticmethod
+    def _detect_null_token(raw_sample: "pd.DataFrame") -> str:
+        """Pick the literal NULL marker used in the file, defaulting to empty fields"""
+        counts = {token: int((raw_sample == token).sum().sum()) for token in NULL_TOKENS}
+        token, hits = max(counts.items(), key=lambda item: item[1])
+        return token if hits else ""
+    
+    @staticmethod
+    def _arrow_column_types(dtypes: "pd.Series") -> dict:
+        """Pin Arrow parse types to the table's columns so every batch matches it"""
+        import pyarrow as pa
+        column_types = {}
+        for name, dtype in dtypes.items():
+            if dtype.kind in "iu":
+                column_types[str(name)] = pa.int64()
+            elif dtype.kind == "f":
+                column_types[str(name)] = pa.float64()
+            elif dtype.kind == "b":
+                column_types[str(name)] = pa.bool_()
+            else:
+                column_types[str(name)] = pa.string()
+        return column_types
+    
+    def create_table_from_csv(self, csv_path: str, table_name: str = "csv_data", workers: int = 1,
+                              stream: bool = True, backend: str = "arrow") -> str:
+        """Create a table based on CSV structure and import data
+
+        By default the file is streamed byte-for-byte into COPY. With workers > 1
+        it is split on newlines and loaded over that many connections in parallel
+        (see parallel_copy for the trade-offs). stream=False parses the file on the
+        client instead: backend="arrow" uses PyArrow's multi-threaded reader and
+        binary COPY, backend="pandas" uses bounded pandas chunks and CSV COPY. Loads into
+        an existing table always use CSV COPY, since binary fields must match its column types.
+        """
+        try:
+            pd = _lazy_pd()
+            # Sample the file to pick the NULL marker and infer column types
+            raw_sample = pd.read_csv(csv_path, nrows=TYPE_SAMPLE_ROWS, dtype=str, keep_default_na=False)
+            null_token = self._detect_null_token(raw_sample)
+            df_sample = pd.read_csv(
+                csv_path,
+                nrows=TYPE_SAMPLE_ROWS,
+                keep_default_na=False,
+                na_values=[null_token, ""],
+            )
 
             inspector = inspect(self.engine)
             table_exists = inspector.has_table(table_name)
 
-            # If table exists, TRUNCATE it to avoid dropping dependencies (e.g., views), then append
-            if table_exists:
+            # Create an empty table with the inferred column types
+            if not table_exists:
+                df_sample.head(0).to_sql(name=table_name, con=self.engine, index=False)
+
+            # Binary COPY encodes fields from the sample's dtypes, which only match a table created
+            # from that sample; an existing table gets text COPY so PostgreSQL parses into its own types
+            if table_exists and backend == "arrow":
+                backend = "pandas"
+
+            load_args = (csv_path, table_name, null_token, workers, stream, backend)
+            type_errors = (psycopg2.DataError,)
+            if not stream and backend == "arrow":
+                import pyarrow as pa
+                type_errors += (pa.ArrowInvalid,)
+            try:
+                self._load_csv(*load_args, dtypes=df_sample.dtypes, truncate=table_exists)
+            except type_errors as e:
+                # The sample's types did not fit every row; only retry tables we just created
+                if table_exists:
+                    raise
+                logger.warning(f"Inferred column types did not fit '{table_name}' ({e}); reloading as TEXT")
+                text_sample = df_sample.head(0).astype(object)
                 with self.engine.begin() as conn:
-                    conn.execute(text(f"TRUNCATE TABLE {table_name};"))
-                if_exists_mode = 'append'
-            else:
-                if_exists_mode = 'fail'
-
-            # Load data
-            df.to_sql(
-                name=table_name,
-                con=self.engine,
-                if_exists=if_exists_mode,
-                index=False,
-                method='multi',
-                chunksize=10000
-            )
+                    conn.execute(text(f"DROP TABLE {quote_ident(table_name)}"))
+                text_sample.to_sql(name=table_name, con=self.engine, index=False)
+                self._load_csv(*load_args, dtypes=text_sample.dtypes, truncate=False)
             
-            # Get row count
-            with self.engine.connect() as conn:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                row_count = result.scalar()
+            # Refresh planner stats and read the row count from them
+            row_count = self.fast_row_count(table_name)
             
             logger.info(f"Successfully imported {row_count} rows into table '{table_name}'")
             return f"Imported {row_count} rows into table '{table_name}'"
@@ -80,48 +396,248 @@ class CSVImporter:
             logger.error(f"Error importing CSV: {e}")
             raise
     
-    def query_table(self, table_name: str, limit: int = 10) -> list:
-        """Query data from the imported table"""
+    def _load_csv(self, csv_path: str, table_name: str, null_token: str, workers: int,
+                  stream: bool, backend: str, dtypes: "pd.Series", truncate: bool) -> None:
+        """COPY a CSV into an existing table whose columns match `dtypes`"""
+        pd = _lazy_pd()
+        column_list_sql = _column_list_sql(tuple(dtypes.index))
+        copy_prefix = f"COPY {quote_ident(table_name)} ({column_list_sql}) FROM STDIN WITH (FORMAT csv"
+
+        if not stream and backend == "arrow":
+            import pyarrow.csv as pacsv
+
+            read_options = pacsv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE)
+            convert_options = pacsv.ConvertOptions(
+                column_types=self._arrow_column_types(dtypes),
+                null_values=[null_token, ""],
+                strings_can_be_null=True,
+            )
+
+            # Encoders follow the empty sample frame to_sql created the table from, so a batch
+            # whose column is all nulls (or ints-with-nulls objects) still matches the table
+            encoders = [
+                encode for _, encode in self._binary_column_specs(
+                    pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+                )
+            ]
+
+            def load_batches(cur):
+                reader = pacsv.open_csv(csv_path, read_options=read_options, convert_options=convert_options)
+                for batch in reader:
+                    # integer_object_nulls keeps exact Python ints in nullable integer columns
+                    df = batch.to_pandas(integer_object_nulls=True)
+                    self._binary_copy_from_df(cur, df, table_name, encoders)
+
+            self._copy_in_transaction(table_name, truncate, load_batches)
+        elif not stream:
+            copy_sql = f"{copy_prefix}, HEADER false, NULL '{null_token}')"
+
+            def load_chunks(cur):
+                for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS, dtype=str):
+                    buf = io.StringIO()
+                    chunk.to_csv(buf, index=False, header=False, na_rep=null_token)
+                    buf.seek(0)
+                    cur.copy_expert(copy_sql, buf)
+
+            self._copy_in_transaction(table_name, truncate, load_chunks)
+        elif workers > 1:
+            if truncate:
+                with self.engine.begin() as conn:
+                    conn.execute(text(f"TRUNCATE TABLE {quote_ident(table_name)};"))
+            copy_sql = f"{copy_prefix}, HEADER false, NULL '{null_token}')"
+            parallel_copy(csv_path, copy_sql, self.engine.raw_connection, workers=workers)
+        else:
+            copy_sql = f"{copy_prefix}, HEADER true, NULL '{null_token}')"
+
+            def load_file(cur):
+                with open(csv_path, 'rb') as f:
+                    cur.copy_expert(copy_sql, f)
+
+            self._copy_in_transaction(table_name, truncate, load_file)
+    
+    @staticmethod
+    def _binary_column_spec(col: "pd.Series") -> tuple:
+        """Return (SQLAlchemy column type, binary COPY field encoder) for one column.
+
+        Mirrors the dispatch pandas' to_sql uses (infer_dtype with skipna), so object
+        columns of Python ints, dates or bools get BIGINT/DATE/BOOLEAN fields as well.
+        """
+        from sqlalchemy.types import (
+            TIMESTAMP, BigInteger, Boolean, Date, DateTime, Float, Integer, SmallInteger, Text, Time,
+        )
+        pd = _lazy_pd()
+        inferred = pd.api.types.infer_dtype(col, skipna=True)
+        name = col.dtype.name.lower()
+
+        if inferred in ("datetime64", "datetime"):
+            def encode_timestamp(v):
+                return struct.pack("!iq", 8, pd.Timestamp(v).value // 1000 - PG_EPOCH_OFFSET_US)
+            sql_type = TIMESTAMP(timezone=True) if isinstance(col.dtype, pd.DatetimeTZDtype) else DateTime
+            return sql_type, encode_timestamp
+        if inferred == "timedelta64":
+            # to_sql stores timedeltas as integer nanoseconds
+            return BigInteger, lambda v: struct.pack("!iq", 8, pd.Timedelta(v).value)
+        if inferred == "floating":
+            if name == "float32":
+                return Float(precision=23), lambda v: struct.pack("!if", 4, float(v))
+            return Float(precision=53), lambda v: struct.pack("!id", 8, float(v))
+        if inferred == "integer":
+            if name in ("int8", "uint8", "int16"):
+                return SmallInteger, lambda v: struct.pack("!ih", 2, int(v))
+            if name in ("uint16", "int32"):
+                return Integer, lambda v: struct.pack("!ii", 4, int(v))
+            return BigInteger, lambda v: struct.pack("!iq", 8, int(v))
+        if inferred == "boolean":
+            return Boolean, lambda v: struct.pack("!i?", 1, bool(v))
+        if inferred == "date":
+            return Date, lambda v: struct.pack("!ii", 4, (v - PG_EPOCH_DATE).days)
+        if inferred == "time":
+            def encode_time(v):
+                us = ((v.hour * 60 + v.minute) * 60 + v.second) * 1000000 + v.microsecond
+                return struct.pack("!iq", 8, us)
+            return Time, encode_time
+
+        def encode_text(v):
+            data = str(v).encode("utf-8")
+            return struct.pack("!i", len(data)) + data
+        return Text, encode_text
+    
+    @classmethod
+    def _binary_column_specs(cls, df: "pd.DataFrame") -> list:
+        """_binary_column_spec for every column of `df`, in column order"""
+        return [cls._binary_column_spec(df.iloc[:, i]) for i in range(df.shape[1])]
+    
+    def _binary_copy_from_df(self, cur, df: "pd.DataFrame", table_name: str, encoders: list = None) -> None:
+        """Stream a DataFrame into an existing table using binary COPY
+
+        The table's columns must have the types _binary_column_spec picks for `df`.
+        `encoders` overrides that choice, e.g. so every batch of one load is encoded
+        for the table created from the first sample even where a batch is all nulls.
+        """
+        column_list_sql = _column_list_sql(tuple(df.columns))
+        copy_sql = f"COPY {quote_ident(table_name)} ({column_list_sql}) FROM STDIN WITH (FORMAT BINARY)"
+        pd = _lazy_pd()
+        if encoders is None:
+            encoders = [encode for _, encode in self._binary_column_specs(df)]
+        field_count = struct.pack("!h", len(encoders))
+        null_field = struct.pack("!i", -1)
+
+        def flush(buf):
+            buf.write(PGCOPY_TRAILER)
+            buf.seek(0)
+            cur.copy_expert(copy_sql, buf)
+
+        buf = io.BytesIO()
+        buf.write(PGCOPY_HEADER)
+        for row in df.itertuples(index=False, name=None):
+            buf.write(field_count)
+            for encode, value in zip(encoders, row):
+                buf.write(null_field if pd.isna(value) else encode(value))
+            if buf.tell() >= BINARY_COPY_CHUNK_BYTES:
+                flush(buf)
+                buf = io.BytesIO()
+                buf.write(PGCOPY_HEADER)
+        flush(buf)
+    
+    def _csv_copy_from_df(self, cur, df: "pd.DataFrame", table_name: str) -> None:
+        """Stream a DataFrame into an existing table using text (CSV) COPY"""
+        column_list_sql = _column_list_sql(tuple(df.columns))
+        copy_sql = (
+            f"COPY {quote_ident(table_name)} ({column_list_sql}) FROM STDIN "
+            f"WITH (FORMAT csv, HEADER false, NULL '{NULL_SENTINEL}')"
+        )
+        for start in range(0, len(df), CSV_CHUNK_ROWS):
+            buf = io.StringIO()
+            df.iloc[start:start + CSV_CHUNK_ROWS].to_csv(buf, index=False, header=False, na_rep=NULL_SENTINEL)
+            buf.seek(0)
+            cur.copy_expert(copy_sql, buf)
+    
+    def import_dataframe(self, df: "pd.DataFrame", table_name: str) -> str:
+        """Import an in-memory DataFrame into a table without a CSV round-trip"""
         try:
-            with self.engine.connect() as conn:
-                result = conn.execute(text(f"SELECT * FROM {table_name} LIMIT {limit}"))
-                columns = result.keys()
-                rows = result.fetchall()
-                
-                # Convert to list of dictionaries
-                data = [dict(zip(columns, row)) for row in rows]
-                return data
+            inspector = inspect(self.engine)
+            if inspector.has_table(table_name):
+                # The existing columns may not match what binary encoding would pick; text COPY lets
+                # PostgreSQL parse each value into whatever type the table already has
+                self._copy_in_transaction(table_name, True, lambda cur: self._csv_copy_from_df(cur, df, table_name))
+            else:
+                # Create the table from the same per-column dispatch the binary encoders use
+                specs = self._binary_column_specs(df)
+                df.head(0).to_sql(
+                    name=table_name, con=self.engine, index=False,
+                    dtype={str(column): sql_type for column, (sql_type, _) in zip(df.columns, specs)},
+                )
+                encoders = [encode for _, encode in specs]
+                self._copy_in_transaction(
+                    table_name, False, lambda cur: self._binary_copy_from_df(cur, df, table_name, encoders)
+                )
+
+            logger.info(f"Successfully imported {len(df)} rows into table '{table_name}'")
+            return f"Imported {len(df)} rows into table '{table_name}'"
+            
+        except Exception as e:
+            logger.error(f"Error importing DataFrame: {e}")
+            raise
+    
+    def fast_row_count(self, table_name: str) -> int:
+        """ANALYZE the table and return pg_class.reltuples instead of scanning it with COUNT(*).
+
+        Exact when ANALYZE reads every page (small tables), otherwise the planner's estimate.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text(f"ANALYZE {quote_ident(table_name)}"))
+            result = conn.execute(text(TABLE_ROW_ESTIMATE_SQL), {"t": quote_ident(table_name)})
+            return max(result.scalar() or 0, 0)
+    
+    def estimated_row_count(self, table_name: str) -> int:
+        """pg_class.reltuples as left by the last ANALYZE, without running a new one.
+
+        create_table_from_csv already analyzes the table, so callers reporting its
+        row count afterwards should use this rather than fast_row_count.
+        """
+        with self.engine.connect() as conn:
+            result = conn.execute(text(TABLE_ROW_ESTIMATE_SQL), {"t": quote_ident(table_name)})
+            return max(result.scalar() or 0, 0)
+    
+    def query_table_rows(self, table_name: str, limit: int = 10) -> tuple:
+        """Query data from the imported table as (column names, row tuples)"""
+        try:
+            # Quoted identifier + bound LIMIT; rows stream from a server-side cursor
+            stmt = text(f"SELECT * FROM {quote_ident(table_name)} LIMIT :limit")
+            batch = min(max(int(limit), 1), QUERY_BATCH_ROWS)
+            with self.engine.connect().execution_options(stream_results=True, yield_per=batch) as conn:
+                result = conn.execute(stmt, {"limit": int(limit)})
+                return list(result.keys()), [tuple(row) for row in result]
                 
         except Exception as e:
             logger.error(f"Error querying table: {e}")
             raise
     
-    def get_table_info(self, table_name: str) -> dict:
-        """Get information about a table"""
+    def query_table(self, table_name: str, limit: int = 10) -> list:
+        """Query data from the imported table"""
+        columns, rows = self.query_table_rows(table_name, limit)
+        
+        # Convert to list of dictionaries
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def get_table_info(self, table_name: str, exact: bool = False) -> dict:
+        """Get information about a table.
+
+        row_count is the pg_class.reltuples estimate unless exact=True (or the table
+        has never been analyzed), in which case it is a full COUNT(*).
+        """
         try:
-            inspector = inspect(self.engine)
-            
-            if not inspector.has_table(table_name):
-                return {"error": f"Table '{table_name}' does not exist"}
-            
-            columns = inspector.get_columns(table_name)
-            
             with self.engine.connect() as conn:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                row_count = result.scalar()
+                columns = conn.execute(text(TABLE_COLUMNS_SQL), {"t": quote_ident(table_name)}).fetchall()
+                
+                if not columns:
+                    return {"error": f"Table '{table_name}' does not exist"}
+                
+                count_row = conn.execute(
+                    text(table_row_count_sql(table_name, exact)), {"t": quote_ident(table_name)}
+                ).one()
             
-            return {
-                "table_name": table_name,
-                "row_count": row_count,
-                "columns": [
-                    {
-                        "name": col["name"],
-                        "type": str(col["type"]),
-                        "nullable": col["nullable"]
-                    }
-                    for col in columns
-                ]
-            }
+            return table_info_result(table_name, columns, count_row)
             
         except Exception as e:
             logger.error(f"Error getting table info: {e}")
@@ -5,14 +5,121 @@ import shutil
 import logging
 from typing import List, Dict, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ioctl request for a copy-on-write clone (btrfs/XFS reflink)
+FICLONE = 0x40049409
+
 class KaggleDownloader:
     def __init__(self, download_dir: str = "./datasets"):
         """Initialize Kaggle downloader with a download directory"""
         self.download_dir = download_dir
         os.makedirs(download_dir, exist_ok=True)
+        # download_dataset payloads by dataset name, so repeat imports skip the directory scan
+        self._manifests: Dict[str, Dict] = {}
+    
+    @staticmethod
+    def _scan(path: str):
+        """Yield (abs_path, rel_path, size) for every file under path in a single scandir pass"""
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path, os.path.relpath(entry.path, path), entry.stat().st_size
+
+    @staticmethod
+    def _fast_copy(src_path: str, dst_path: str) -> None:
+        """Populate dst from src by hardlink, then reflink, falling back to a full copy"""
+        if os.path.lexists(dst_path):
+            os.remove(dst_path)
+        try:
+            os.link(src_path, dst_path)
+            return
+        except OSError:
+            pass
+        if fcntl is not None:
+            try:
+                with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(src_path, dst_path)
+                return
+            except OSError:
+                pass
+        # Cross-device without reflink support; copy2 uses in-kernel sendfile on Linux
+        shutil.copy2(src_path, dst_path)
+
+    def _collect_files(self, dataset_dir: str):
+        """Return (files, csv_files) metadata lists for a cached dataset directory"""
+        files = []
+        csv_files = []
+        for file_path, rel_path, file_size in self._scan(dataset_dir):
+            info = {
+                "name": os.path.basename(file_path),
+                "path": file_path,
+                "size_mb": round(file_size / (1024 * 1024), 2),
+                "relative_path": rel_path
+            }
+            files.append(info)
+            if file_path.lower().endswith('.csv'):
+                csv_files.append(info)
+        return files, csv_files
+
+    @staticmethod
+    def _build_result(dataset_name: str, dataset_dir: str, files: list, csv_files: list) -> Dict:
+        """Build the download_dataset success payload"""
+        return {
+            "dataset_name": dataset_name,
+            "download_path": dataset_dir,
+            "total_files": len(files),
+            "csv_files": len(csv_files),
+            "files": files,
+            "csv_file_paths": [f["path"] for f in csv_files],
+            # First path wins when two CSVs share a basename, as with a linear scan
+            "csv_index": {f["name"]: f["path"] for f in reversed(csv_files)},
+            "status": "success"
+        }
+
+    def _dataset_dir(self, dataset_name: str) -> str:
+        """Deterministic local cache path for a dataset"""
+        return os.path.join(self.download_dir, dataset_name.replace('/', '__'))
+
+    def is_downloaded(self, dataset_name: str, scan_disk: bool = True) -> Optional[Dict]:
+        """
+        Return the cached download_dataset payload if the dataset is already local
+        
+        Args:
+            dataset_name: Kaggle dataset name
+            scan_disk: Also look for CSVs in the cache directory when the manifest
+                is not in memory yet (False keeps this a pure dictionary lookup)
+            
+        Returns:
+            The success payload, or None if the dataset still needs downloading
+        """
+        manifest = self._manifests.get(dataset_name)
+        if manifest is not None and os.path.isdir(manifest["download_path"]):
+            return manifest
+        if not scan_disk:
+            return None
+
+        local_dataset_dir = self._dataset_dir(dataset_name)
+        if not os.path.isdir(local_dataset_dir):
+            return None
+        files, csv_files = self._collect_files(local_dataset_dir)
+        if not csv_files:
+            return None
+        manifest = self._build_result(dataset_name, local_dataset_dir, files, csv_files)
+        self._manifests[dataset_name] = manifest
+        return manifest
     
     def download_dataset(self, dataset_name: str) -> Dict[str, str]:
         """
@@ -27,72 +134,29 @@ class KaggleDownloader:
         try:
             logger.info(f"Downloading dataset: {dataset_name}")
             
-            # Deterministic local cache path for this dataset
-            safe_name = dataset_name.replace('/', '__')
-            local_dataset_dir = os.path.join(self.download_dir, safe_name)
-            os.makedirs(local_dataset_dir, exist_ok=True)
-
             # If already cached with CSVs, skip fresh download
-            existing_csvs = self.get_csv_files_from_dataset(local_dataset_dir)
-            if existing_csvs:
-                logger.info(f"Using cached dataset at {local_dataset_dir} ({len(existing_csvs)} CSVs)")
-                files = []
-                for root, _, filenames in os.walk(local_dataset_dir):
-                    for filename in filenames:
-                        file_path = os.path.join(root, filename)
-                        file_size = os.path.getsize(file_path)
-                        files.append({
-                            "name": filename,
-                            "path": file_path,
-                            "size_mb": round(file_size / (1024 * 1024), 2),
-                            "relative_path": os.path.relpath(file_path, local_dataset_dir)
-                        })
-                csv_files = [f for f in files if f["name"].lower().endswith('.csv')]
-                return {
-                    "dataset_name": dataset_name,
-                    "download_path": local_dataset_dir,
-                    "total_files": len(files),
-                    "csv_files": len(csv_files),
-                    "files": files,
-                    "csv_file_paths": [f["path"] for f in csv_files],
-                    "status": "success"
-                }
+            cached = self.is_downloaded(dataset_name)
+            if cached:
+                logger.info(f"Using cached dataset at {cached['download_path']} ({cached['csv_files']} CSVs)")
+                return cached
+
+            local_dataset_dir = self._dataset_dir(dataset_name)
+            os.makedirs(local_dataset_dir, exist_ok=True)
 
             # Otherwise, download and copy into cache directory
             path = kagglehub.dataset_download(dataset_name)
 
             # Copy all files from KaggleHub temp path to our cache folder
-            for root, _, filenames in os.walk(path):
-                for filename in filenames:
-                    src_path = os.path.join(root, filename)
-                    rel = os.path.relpath(src_path, path)
-                    dst_path = os.path.join(local_dataset_dir, rel)
-                    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-                    shutil.copy2(src_path, dst_path)
+            for src_path, rel, _ in self._scan(path):
+                dst_path = os.path.join(local_dataset_dir, rel)
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                self._fast_copy(src_path, dst_path)
 
             # Scan cached directory
-            files = []
-            for root, _, filenames in os.walk(local_dataset_dir):
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    file_size = os.path.getsize(file_path)
-                    files.append({
-                        "name": filename,
-                        "path": file_path,
-                        "size_mb": round(file_size / (1024 * 1024), 2),
-                        "relative_path": os.path.relpath(file_path, local_dataset_dir)
-                    })
-            csv_files = [f for f in files if f["name"].lower().endswith('.csv')]
-
-            result = {
-                "dataset_name": dataset_name,
-                "download_path": local_dataset_dir,
-                "total_files": len(files),
-                "csv_files": len(csv_files),
-                "files": files,
-                "csv_file_paths": [f["path"] for f in csv_files],
-                "status": "success"
-            }
+            files, csv_files = self._collect_files(local_dataset_dir)
+            result = self._build_result(dataset_name, local_dataset_dir, files, csv_files)
+            if csv_files:
+                self._manifests[dataset_name] = result
 
             logger.info(f"Cached {len(files)} files ({len(csv_files)} CSV) to {local_dataset_dir}")
             return result
@@ -114,10 +178,7 @@ class KaggleDownloader:
                     item_path = os.path.join(self.download_dir, item)
                     if os.path.isdir(item_path):
                         # Count files in the dataset directory
-                        files = []
-                        for root, dirs, filenames in os.walk(item_path):
-                            for filename in filenames:
-                                files.append(filename)
+                        files = [os.path.basename(p) for p, _, _ in self._scan(item_path)]
                         
                         datasets.append({
                             "name": item,
@@ -135,13 +196,7 @@ class KaggleDownloader:
     def get_csv_files_from_dataset(self, dataset_path: str) -> List[str]:
         """Get all CSV files from a downloaded dataset"""
         try:
-            csv_files = []
-            for root, dirs, filenames in os.walk(dataset_path):
-                for filename in filenames:
-                    if filename.lower().endswith('.csv'):
-                        csv_files.append(os.path.join(root, filename))
-            
-            return csv_files
+            return [p for p, _, _ in self._scan(dataset_path) if p.lower().endswith('.csv')]
             
         except Exception as e:
             logger.error(f"Error finding CSV files: {e}")
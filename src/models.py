@@ -1,7 +1,9 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
@@ -19,12 +21,33 @@ class CSVData(Base):
     # Dynamic columns will be added based on CSV structure
     # This is a flexible approach that can handle any CSV structure
 
-def get_database_engine():
-    """Get database engine from environment"""
-    DATABASE_URL = os.getenv("DATABASE_URL")
-    if not DATABASE_URL:
+@lru_cache(maxsize=8)
+def _cached_engine(database_url: str):
+    """Create one pooled engine per URL so connections are reused across callers"""
+    dialect_kwargs = {}
+    if make_url(database_url).get_driver_name() == "psycopg2":
+        # Batch any executemany() UPDATE/DELETEs too; INSERTs already use insertmanyvalues
+        dialect_kwargs = dict(
+            executemany_mode="values_plus_batch",
+            executemany_batch_page_size=500,
+            insertmanyvalues_page_size=1000,
+        )
+    return create_engine(
+        database_url,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        query_cache_size=1200,
+        **dialect_kwargs,
+    )
+
+def get_database_engine(database_url: str = None):
+    """Get the shared database engine for a URL (defaults to DATABASE_URL from environment)"""
+    database_url = database_url or os.getenv("DATABASE_URL")
+    if not database_url:
         raise ValueError("DATABASE_URL environment variable not set")
-    return create_engine(DATABASE_URL)
+    return _cached_engine(database_url)
 
 def get_session():
     """Get database session"""
@@ -1,10 +1,18 @@
 import os
+import io
+import csv
+import json
 import asyncio
+import asyncpg
+import threading
+from cachetools import TTLCache
 from fastmcp import FastMCP
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from dotenv import load_dotenv
-from csv_importer import CSVImporter
-from models import create_tables
+from csv_importer import CSVImporter, NULL_SENTINEL, TABLE_COLUMNS_SQL, quote_ident, table_info_result, table_row_count_sql
+from models import create_tables, get_database_engine
 from kaggle_downloader import KaggleDownloader
 import logging
 
@@ -15,7 +23,81 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
+# Pooled engine shared with csv_importer (see models.get_database_engine); only the
+# COPY-based import paths need it, since they work on raw psycopg2 connections
+engine = get_database_engine(DATABASE_URL)
+
+# Async engine for the small read-only introspection tools, so each one awaits its
+# round-trip instead of holding a worker thread
+aengine = create_async_engine(
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_size=20,
+    pool_pre_ping=True,
+    query_cache_size=1200,
+)
+
+# Statements built once at import so tool calls reuse them (and their compiled form)
+_SQL_VERSION = text("SELECT version();")
+_SQL_LIST_TABLES = text("""
+    SELECT table_name 
+    FROM information_schema.tables 
+    WHERE table_schema = 'public'
+    ORDER BY table_name;
+""")
+_SQL_TABLE_COLUMNS = text(TABLE_COLUMNS_SQL)
+
+# Server version string, fetched once per process
+_pg_version = None
+
+# Separator lines for the tool output, built once
+_SEP_80 = "=" * 80 + "\n"
+_SEP_60 = "=" * 60 + "\n"
+
+# Short-lived cache for list_tables/get_table_info results, cleared after every import
+SCHEMA_CACHE_TTL_SECONDS = 30
+_schema_cache = TTLCache(maxsize=256, ttl=SCHEMA_CACHE_TTL_SECONDS)
+_schema_cache_lock = threading.Lock()
+
+def _cached_schema(key):
+    with _schema_cache_lock:
+        return _schema_cache.get(key)
+
+def _store_schema(key, value):
+    with _schema_cache_lock:
+        _schema_cache[key] = value
+
+def invalidate_schema_cache():
+    """Drop cached table metadata after the schema or row counts change."""
+    with _schema_cache_lock:
+        _schema_cache.clear()
+
+# asyncpg pool for ingest tools, created on first use inside the server's event loop
+ASYNCPG_DSN = (
+    make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    if DATABASE_URL else None
+)
+_pg_pool = None
+_pg_pool_lock = asyncio.Lock()
+
+# Target column types for bulk_load, looked up once per call
+_PG_COLUMN_TYPES_SQL = """
+    SELECT a.attname, t.typname
+    FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid
+    WHERE a.attrelid = to_regclass($1) AND a.attnum > 0 AND NOT a.attisdropped
+"""
+# Column types whose asyncpg binary codec takes decoded JSON values as-is (ints / strings)
+_BINARY_JSON_TYPES = {
+    "int2": int, "int4": int, "int8": int,
+    "text": str, "varchar": str, "bpchar": str,
+}
+
+async def get_pg_pool() -> asyncpg.Pool:
+    """Return the shared asyncpg pool, creating it on first call."""
+    global _pg_pool
+    async with _pg_pool_lock:
+        if _pg_pool is None:
+            _pg_pool = await asyncpg.create_pool(dsn=ASYNCPG_DSN, min_size=2, max_size=10)
+    return _pg_pool
 
 # Initialize CSV importer and Kaggle downloader
 csv_importer = CSVImporter()
@@ -25,10 +107,15 @@ mcp = FastMCP("csv-mcp-server")
 
 async def test_db_connection() -> str:
     """Test the Postgres + pgvector connection."""
+    global _pg_version
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT version();"))
-            return str(result.scalar())
+        # Checking out a pooled connection runs the pre-ping, so connectivity is
+        # still verified on every call; only the version query is cached
+        async with aengine.connect() as conn:
+            if _pg_version is None:
+                result = await conn.execute(_SQL_VERSION)
+                _pg_version = str(result.scalar())
+        return _pg_version
     except Exception as e:
         return f"Database connection failed: {str(e)}"
 
@@ -37,7 +124,7 @@ mcp.tool()(test_db_connection)
 async def analyze_csv(csv_path: str) -> str:
     """Analyze a CSV file and return its structure and metadata."""
     try:
-        analysis = csv_importer.analyze_csv(csv_path)
+        analysis = await asyncio.to_thread(csv_importer.analyze_csv, csv_path)
         return f"CSV Analysis:\n" \
                f"- File: {analysis['file_path']}\n" \
                f"- Rows: {analysis['total_rows']}\n" \
@@ -52,88 +139,191 @@ mcp.tool()(analyze_csv)
 async def import_csv(csv_path: str, table_name: str = "csv_data") -> str:
     """Import a CSV file into the database."""
     try:
-        result = csv_importer.create_table_from_csv(csv_path, table_name)
+        result = await asyncio.to_thread(csv_importer.create_table_from_csv, csv_path, table_name)
+        invalidate_schema_cache()
         return f"Success: {result}"
     except Exception as e:
         return f"Error importing CSV: {str(e)}"
 
 mcp.tool()(import_csv)
 
-async def query_data(table_name: str = "csv_data", limit: int = 10) -> str:
+def _error(message: str, as_text: bool):
+    return message if as_text else {"error": message}
+
+def format_query_text(table_name: str, columns: list, rows: list) -> str:
+    """Render query_data results as the human-readable row listing."""
+    if not rows:
+        return f"No data found in table '{table_name}'"
+    
+    # Per-column prefixes are built once and everything is written into a single buffer
+    prefixes = [f"  📌 {col}: " for col in columns]
+    buf = io.StringIO()
+    buf.write(f"📊 Data from '{table_name}' (showing {len(rows)} rows):\n")
+    buf.write(f"📋 Columns ({len(columns)}): {', '.join(columns)}\n")
+    buf.write(_SEP_80)
+    write = buf.write
+    
+    for i, row in enumerate(rows, 1):
+        write(f"\n🔹 Row {i}:\n")
+        for prefix, value in zip(prefixes, row):
+            # Truncate long values for better display
+            value_str = value if isinstance(value, str) else str(value)
+            if len(value_str) > 100:
+                value_str = value_str[:100] + "..."
+            write(prefix)
+            write(value_str)
+            write("\n")
+    
+    return buf.getvalue()
+
+def format_table_info_text(info: dict) -> str:
+    """Render a get_table_info payload as the human-readable column listing."""
+    columns = info["columns"]
+    buf = io.StringIO()
+    rows = info["row_count"] if info["row_count_exact"] else f"~{info['row_count']} (estimate from last ANALYZE)"
+    buf.write(f"📋 Table: {info['table_name']}\n📊 Rows: {rows}\n📝 Columns ({len(columns)}):\n")
+    buf.write(_SEP_60)
+    
+    for i, col in enumerate(columns, 1):
+        nullable = "NULL" if col["nullable"] else "NOT NULL"
+        buf.write(f"  {i:2d}. 📌 {col['name']:<20} | {col['type']:<15} | {nullable}\n")
+    
+    return buf.getvalue()
+
+def format_tables_text(tables: list) -> str:
+    """Render list_tables output as a bullet list."""
+    if not tables:
+        return "No tables found in the database."
+    return f"Tables in database:\n" + "\n".join(f"- {table}" for table in tables)
+
+# query_data, get_table_info and list_tables return structured dicts that FastMCP
+# serializes once; as_text=True keeps the formatted text for human readers
+
+async def query_data(table_name: str = "csv_data", limit: int = 10, as_text: bool = False) -> dict | str:
     """Query data from the imported CSV table."""
     try:
-        data = csv_importer.query_table(table_name, limit)
-        if not data:
-            return f"No data found in table '{table_name}'"
-        
-        # Get column names from first row
-        columns = list(data[0].keys()) if data else []
-        
-        # Format the data nicely with column headers
-        result = f"📊 Data from '{table_name}' (showing {len(data)} rows):\n"
-        result += f"📋 Columns ({len(columns)}): {', '.join(columns)}\n"
-        result += "=" * 80 + "\n"
-        
-        for i, row in enumerate(data, 1):
-            result += f"\n🔹 Row {i}:\n"
-            for key, value in row.items():
-                # Truncate long values for better display
-                display_value = str(value)[:100] + "..." if len(str(value)) > 100 else str(value)
-                result += f"  📌 {key}: {display_value}\n"
-        
-        return result
+        columns, rows = await asyncio.to_thread(csv_importer.query_table_rows, table_name, limit)
+        if as_text:
+            return format_query_text(table_name, columns, rows)
+        return {"table": table_name, "columns": columns, "rows": rows}
     except Exception as e:
-        return f"Error querying data: {str(e)}"
+        return _error(f"Error querying data: {str(e)}", as_text)
 
 mcp.tool()(query_data)
 
-async def get_table_info(table_name: str = "csv_data") -> str:
-    """Get information about a database table."""
+async def get_table_info(table_name: str = "csv_data", exact: bool = False, as_text: bool = False) -> dict | str:
+    """Get information about a database table.
+    
+    The row count is the planner's estimate (pg_class.reltuples) unless exact=True,
+    which runs a full COUNT(*) scan.
+    """
     try:
-        info = csv_importer.get_table_info(table_name)
-        if "error" in info:
-            return info["error"]
-        
-        result = f"📋 Table: {info['table_name']}\n"
-        result += f"📊 Rows: {info['row_count']}\n"
-        result += f"📝 Columns ({len(info['columns'])}):\n"
-        result += "=" * 60 + "\n"
-        
-        for i, col in enumerate(info['columns'], 1):
-            nullable = "NULL" if col['nullable'] else "NOT NULL"
-            result += f"  {i:2d}. 📌 {col['name']:<20} | {col['type']:<15} | {nullable}\n"
+        info = _cached_schema(("info", table_name, exact))
+        if info is None:
+            async with aengine.connect() as conn:
+                result = await conn.execute(_SQL_TABLE_COLUMNS, {"t": quote_ident(table_name)})
+                columns = result.fetchall()
+                
+                if not columns:
+                    return _error(f"Table '{table_name}' does not exist", as_text)
+                
+                result = await conn.execute(text(table_row_count_sql(table_name, exact)), {"t": quote_ident(table_name)})
+                count_row = result.one()
+            
+            info = table_info_result(table_name, columns, count_row)
+            _store_schema(("info", table_name, exact), info)
         
-        return result
+        return format_table_info_text(info) if as_text else info
     except Exception as e:
-        return f"Error getting table info: {str(e)}"
+        return _error(f"Error getting table info: {str(e)}", as_text)
 
 mcp.tool()(get_table_info)
 
-async def list_tables() -> str:
+async def list_tables(as_text: bool = False) -> dict | str:
     """List all tables in the database."""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                ORDER BY table_name;
-            """))
-            tables = [row[0] for row in result.fetchall()]
-            
-            if not tables:
-                return "No tables found in the database."
-            
-            return f"Tables in database:\n" + "\n".join(f"- {table}" for table in tables)
+        tables = _cached_schema(("tables",))
+        if tables is None:
+            async with aengine.connect() as conn:
+                result = await conn.execute(_SQL_LIST_TABLES)
+                tables = [row[0] for row in result.fetchall()]
+            _store_schema(("tables",), tables)
+        
+        return format_tables_text(tables) if as_text else {"tables": tables}
     except Exception as e:
-        return f"Error listing tables: {str(e)}"
+        return _error(f"Error listing tables: {str(e)}", as_text)
 
 mcp.tool()(list_tables)
 
+def _binary_copy_safe(columns: list, col_types: dict, rows: list) -> bool:
+    """True when every value already has the Python type the column's binary codec expects"""
+    expected = [_BINARY_JSON_TYPES.get(col_types[col]) for col in columns]
+    if None in expected:
+        return False
+    # type() rather than isinstance: bool is an int, but not a valid integer column value
+    return all(
+        value is None or type(value) is kind
+        for row in rows
+        for value, kind in zip(row, expected)
+    )
+
+def _records_csv(rows: list) -> bytes:
+    """Encode record tuples as CSV that PostgreSQL parses into the table's own column types"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([
+            NULL_SENTINEL if value is None
+            else ("true" if value else "false") if isinstance(value, bool)
+            else json.dumps(value) if isinstance(value, (dict, list))
+            else value
+            for value in row
+        ])
+    return buf.getvalue().encode()
+
+async def bulk_load(table_name: str, records: list[dict]) -> str:
+    """Bulk-load JSON records into an existing table using COPY.
+    
+    Binary COPY is used when every column is an integer or text column holding matching
+    values; anything else (dates, numerics, uuids, JSON, ...) goes through CSV COPY so
+    PostgreSQL parses the values into the column types.
+    """
+    try:
+        if not records:
+            return "No records provided."
+        
+        # Columns are the union of keys in first-seen order; missing keys load as NULL
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        rows = [tuple(record.get(col) for col in columns) for record in records]
+        
+        pool = await get_pg_pool()
+        async with pool.acquire() as conn:
+            col_types = dict(await conn.fetch(_PG_COLUMN_TYPES_SQL, quote_ident(table_name)))
+            if not col_types:
+                return f"Error bulk loading records: table '{table_name}' does not exist"
+            unknown = [col for col in columns if col not in col_types]
+            if unknown:
+                return f"Error bulk loading records: unknown column(s) {', '.join(unknown)} in '{table_name}'"
+            
+            if _binary_copy_safe(columns, col_types, rows):
+                status = await conn.copy_records_to_table(table_name, records=rows, columns=columns)
+            else:
+                status = await conn.copy_to_table(
+                    table_name, source=io.BytesIO(_records_csv(rows)), columns=columns,
+                    format="csv", null=NULL_SENTINEL,
+                )
+        invalidate_schema_cache()
+        
+        return f"Success: {status} into table '{table_name}'"
+    except Exception as e:
+        return f"Error bulk loading records: {str(e)}"
+
+mcp.tool()(bulk_load)
+
 async def download_kaggle_dataset(dataset_name: str) -> str:
     """Download a dataset from Kaggle and return information about the downloaded files."""
     try:
-        result = kaggle_downloader.download_dataset(dataset_name)
+        result = await asyncio.to_thread(kaggle_downloader.download_dataset, dataset_name)
         
         if result["status"] == "error":
             return f"Error downloading dataset: {result['error']}"
@@ -158,7 +348,7 @@ mcp.tool()(download_kaggle_dataset)
 async def list_downloaded_datasets() -> str:
     """List all downloaded Kaggle datasets."""
     try:
-        datasets = kaggle_downloader.list_downloaded_datasets()
+        datasets = await asyncio.to_thread(kaggle_downloader.list_downloaded_datasets)
         
         if not datasets:
             return "No datasets downloaded yet."
@@ -178,34 +368,44 @@ async def list_downloaded_datasets() -> str:
 
 mcp.tool()(list_downloaded_datasets)
 
+async def _get_dataset(dataset_name: str) -> dict:
+    """Manifest of an already-downloaded dataset, downloading only on a cache miss."""
+    manifest = kaggle_downloader.is_downloaded(dataset_name, scan_disk=False)
+    if manifest is not None:
+        return manifest
+    return await asyncio.to_thread(kaggle_downloader.download_dataset, dataset_name)
+
+def _find_csv(csv_lookup: dict, csv_files: list, csv_filename: str):
+    """Exact basename match first, otherwise the first path containing the name."""
+    return csv_lookup.get(csv_filename) or next((p for p in csv_files if csv_filename in p), None)
+
+def _default_table_name(csv_filename: str) -> str:
+    return os.path.splitext(csv_filename)[0].replace('-', '_').replace(' ', '_')
+
 async def import_kaggle_csv(dataset_name: str, csv_filename: str, table_name: str = None) -> str:
     """Import a specific CSV file from a downloaded Kaggle dataset."""
     try:
         # First, download the dataset if not already downloaded
-        download_result = kaggle_downloader.download_dataset(dataset_name)
+        download_result = await _get_dataset(dataset_name)
         
         if download_result["status"] == "error":
             return f"Error downloading dataset: {download_result['error']}"
         
         # Find the specific CSV file
         csv_files = download_result["csv_file_paths"]
-        target_csv = None
-        
-        for csv_path in csv_files:
-            if csv_filename in csv_path or csv_filename == os.path.basename(csv_path):
-                target_csv = csv_path
-                break
+        csv_lookup = download_result["csv_index"]
+        target_csv = _find_csv(csv_lookup, csv_files, csv_filename)
         
         if not target_csv:
-            available_files = [os.path.basename(f) for f in csv_files]
-            return f"CSV file '{csv_filename}' not found. Available files: {', '.join(available_files)}"
+            return f"CSV file '{csv_filename}' not found. Available files: {', '.join(csv_lookup)}"
         
         # Set default table name if not provided
         if not table_name:
-            table_name = os.path.splitext(csv_filename)[0].replace('-', '_').replace(' ', '_')
+            table_name = _default_table_name(csv_filename)
         
         # Import the CSV
-        import_result = csv_importer.create_table_from_csv(target_csv, table_name)
+        import_result = await asyncio.to_thread(csv_importer.create_table_from_csv, target_csv, table_name)
+        invalidate_schema_cache()
         
         return f"✅ Successfully imported {csv_filename} into table '{table_name}'\n{import_result}"
         
@@ -214,6 +414,44 @@ async def import_kaggle_csv(dataset_name: str, csv_filename: str, table_name: st
 
 mcp.tool()(import_kaggle_csv)
 
+async def import_kaggle_csvs(dataset_name: str, csv_filenames: list[str]) -> str:
+    """Import several CSV files from a downloaded Kaggle dataset concurrently."""
+    try:
+        download_result = await _get_dataset(dataset_name)
+        
+        if download_result["status"] == "error":
+            return f"Error downloading dataset: {download_result['error']}"
+        
+        csv_files = download_result["csv_file_paths"]
+        csv_lookup = download_result["csv_index"]
+        targets = {name: _find_csv(csv_lookup, csv_files, name) for name in csv_filenames}
+        
+        missing = [name for name, path in targets.items() if not path]
+        if missing:
+            return f"CSV files not found: {', '.join(missing)}. Available files: {', '.join(csv_lookup)}"
+        
+        # Each file loads on its own worker thread and pooled connection
+        results = await asyncio.gather(
+            *(asyncio.to_thread(csv_importer.create_table_from_csv, path, _default_table_name(name))
+              for name, path in targets.items()),
+            return_exceptions=True,
+        )
+        invalidate_schema_cache()
+        
+        response = f"📦 Imported from {dataset_name}:\n"
+        for name, result in zip(targets, results):
+            if isinstance(result, Exception):
+                response += f"❌ {name}: {result}\n"
+            else:
+                response += f"✅ {name} -> '{_default_table_name(name)}': {result}\n"
+        
+        return response
+        
+    except Exception as e:
+        return f"Error importing Kaggle CSVs: {str(e)}"
+
+mcp.tool()(import_kaggle_csvs)
+
 if __name__ == "__main__":
     # Create tables on startup
     try:
@@ -222,4 +460,11 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
     
-    asyncio.run(mcp.run())
+    # uvloop cuts per-call overhead for the many small JSON-RPC reads; optional.
+    # mcp.run() starts its own default loop, so drive the run_async coroutine instead
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(mcp.run_async())
+    else:
+        uvloop.run(mcp.run_async())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Container check shared by the docker-based test scripts
+`docker-compose ps` costs ~0.5 s of CLI startup, so a passing check is remembered
+in a stamp file for a short while and reused by the next script in the run
+"""
+
+import os
+import subprocess
+import tempfile
+import time
+
+STAMP_TTL_SECONDS = 30
+
+def missing_containers(names):
+    """Return the container names from `names` that are not up (empty when all are running)"""
+    stamp = os.path.join(tempfile.gettempdir(), ".mcp_containers_up_" + "_".join(sorted(names)))
+    try:
+        if time.time() - os.path.getmtime(stamp) < STAMP_TTL_SECONDS:
+            return []
+    except OSError:
+        pass
+
+    result = subprocess.run(
+        ["docker-compose", "ps"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    )
+    lines = result.stdout.splitlines()
+    missing = [name for name in names if not any(name in line and "Up" in line for line in lines)]
+
+    if not missing:
+        with open(stamp, "a"):
+            pass
+        os.utime(stamp)
+    return missing
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Container-side body of test_csv_columns.py: download, import and show every column
+Piped to `python -` inside the server container (the image has no tests directory)
+"""
+
+import asyncio
+import csv
+import os
+import sys
+sys.path.append('/app/src')
+
+import server
+
+DATASET = "yashdevladdha/uber-ride-analytics-dashboard"
+
+async def test_csv_columns():
+    print("📥 Step 1: Downloading Kaggle dataset...")
+    try:
+        download_result = await server.download_kaggle_dataset(DATASET)
+        print(f"✅ Download successful!")
+        print(f"📁 {download_result}")
+    except Exception as e:
+        print(f"❌ Download failed: {e}")
+        return
+    
+    print("\n📁 Step 2: Listing downloaded datasets...")
+    try:
+        datasets_result = await server.list_downloaded_datasets()
+        print(f"📂 {datasets_result}")
+    except Exception as e:
+        print(f"❌ Failed to list datasets: {e}")
+    
+    print("\n📊 Step 3: Attempting to import CSV data...")
+    try:
+        # Step 1 left the manifest in memory; download_dataset is only a fallback
+        dl = (server.kaggle_downloader.is_downloaded(DATASET, scan_disk=False)
+              or server.kaggle_downloader.download_dataset(DATASET))
+        csvs = sorted(dl.get("csv_file_paths", []), key=os.path.getsize, reverse=True)
+        if not csvs:
+            print("\n❌ Could not import any CSV files. The dataset might not contain CSV files.")
+            return
+        
+        # Largest CSV is the main table; the header line is enough to show its columns
+        target_csv = csvs[0]
+        with open(target_csv, newline="", encoding="utf-8", errors="replace") as f:
+            header = next(csv.reader(f), [])
+        print(f"\n🔄 Importing largest CSV: {os.path.basename(target_csv)} ({len(header)} columns)")
+        import_result = await server.import_kaggle_csv(
+            DATASET, 
+            os.path.basename(target_csv), 
+            "uber_rides"
+        )
+        print(f"✅ Import result: {import_result}")
+        
+        print("\n📋 Step 4: Getting table structure (ALL COLUMNS)...")
+        try:
+            table_info = await server.get_table_info("uber_rides")
+            print(f"\n📊 TABLE STRUCTURE:")
+            print("=" * 80)
+            print(table_info)
+        except Exception as e:
+            print(f"❌ Failed to get table info: {e}")
+        
+        print("\n📊 Step 5: Querying sample data (showing ALL COLUMNS)...")
+        try:
+            query_result = await server.query_data("uber_rides", 5)
+            print(f"\n📈 SAMPLE DATA WITH ALL COLUMNS:")
+            print("=" * 80)
+            print(query_result)
+        except Exception as e:
+            print(f"❌ Failed to query data: {e}")
+        
+        print("\n📋 Step 6: Listing all tables...")
+        try:
+            tables_result = await server.list_tables()
+            print(f"\n📂 {tables_result}")
+        except Exception as e:
+            print(f"❌ Failed to list tables: {e}")
+            
+    except Exception as e:
+        print(f"❌ CSV import process failed: {e}")
+
+asyncio.run(test_csv_columns())
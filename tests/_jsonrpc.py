@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+JSON line encoding shared by the MCP test clients
+orjson encodes straight to bytes and is several times faster; stdlib json is the fallback
+"""
+
+try:
+    import orjson
+    dumps_bytes = orjson.dumps
+    loads_bytes = orjson.loads
+except ImportError:
+    import json
+    
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+    
+    def loads_bytes(data: bytes):
+        return json.loads(data)
@@ -4,303 +4,93 @@ Docker-based test client for the MCP server
 Runs tests inside the Docker container where all dependencies are available
 """
 
-import subprocess
-import json
-import time
+import asyncio
+import os
 import sys
 
-def run_docker_command(command):
+from _containers import missing_containers
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_fixtures", "docker_runner.py")
+
+# (summary name, runner test name, progress line, failure label)
+TESTS = [
+    ("Database Connection", "database_connection", "🔌 Testing database connection...", "Database test"),
+    ("CSV Importer", "csv_importer", "\n📊 Testing CSV importer...", "CSV importer test"),
+    ("Kaggle Downloader", "kaggle_downloader", "\n📥 Testing Kaggle downloader...", "Kaggle downloader test"),
+    ("MCP Tools", "mcp_tools", "\n🔧 Testing MCP tools...", "MCP tools test"),
+    ("Kaggle Download", "kaggle_download", "\n📥 Testing Kaggle dataset download...", "Kaggle download test"),
+    ("CSV Analysis & Columns", "csv_analysis", "\n📊 Testing CSV analysis and column display...", "CSV analysis test"),
+    ("Data Import with Columns", "data_import", "\n📈 Testing data import with column display...", "Data import test"),
+]
+
+# Groups run in parallel container execs; tests inside a group share state (the
+# downloaded dataset, the imported table) and stay sequential
+TEST_GROUPS = [
+    ["database_connection", "csv_importer", "kaggle_downloader", "mcp_tools"],
+    ["kaggle_download", "csv_analysis", "data_import"],
+]
+MAX_PARALLEL_EXECS = 3
+
+async def run_docker_command(command, input=None, timeout=30):
     """Run a command inside the Docker container"""
+    proc = None
     try:
-        result = subprocess.run(
-            ["docker-compose", "exec", "-T", "server"] + command,
-            capture_output=True,
-            text=True,
-            timeout=30
+        proc = await asyncio.create_subprocess_exec(
+            "docker-compose", "exec", "-T", "server", *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(input.encode() if input else None), timeout
         )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
+        return proc.returncode == 0, stdout.decode(), stderr.decode()
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
         return False, "", "Command timed out"
     except Exception as e:
         return False, "", str(e)
 
-def test_database_connection():
-    """Test database connection"""
-    print("🔌 Testing database connection...")
-    
-    # Create a simple test script
-    test_script = '''
-import os
-import sys
-sys.path.append('/app/src')
-from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
-
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-
-try:
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT version();"))
-        version = result.scalar()
-        print(f"✅ Database connected: {version}")
-except Exception as e:
-    print(f"❌ Database connection failed: {e}")
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
-    
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ Database test failed: {stderr}")
-        return False
-
-def test_csv_importer():
-    """Test CSV importer"""
-    print("\n📊 Testing CSV importer...")
-    
-    test_script = '''
-import sys
-sys.path.append('/app/src')
-from csv_importer import CSVImporter
-try:
-    importer = CSVImporter()
-    print("✅ CSV importer initialized successfully")
-except Exception as e:
-    print(f"❌ CSV importer failed: {e}")
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
-    
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ CSV importer test failed: {stderr}")
-        return False
-
-def test_kaggle_downloader():
-    """Test Kaggle downloader"""
-    print("\n📥 Testing Kaggle downloader...")
-    
-    test_script = '''
-import sys
-sys.path.append('/app/src')
-from kaggle_downloader import KaggleDownloader
-try:
-    downloader = KaggleDownloader()
-    print("✅ Kaggle downloader initialized successfully")
-except Exception as e:
-    print(f"❌ Kaggle downloader failed: {e}")
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
-    
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ Kaggle downloader test failed: {stderr}")
-        return False
-
-def test_mcp_tools():
-    """Test MCP tools"""
-    print("\n🔧 Testing MCP tools...")
-    
-    test_script = '''
-import asyncio
-import sys
-sys.path.append('/app/src')
-
-# Import server module
-import server
-
-async def test_tools():
-    try:
-        # Test database connection
-        result = await server.test_db_connection()
-        print(f"✅ Database connection tool: {result[:100]}...")
-        
-        # Test list tables
-        result = await server.list_tables()
-        print(f"✅ List tables tool: {result}")
-        
-        print("✅ MCP tools working")
-    except Exception as e:
-        print(f"❌ MCP tools failed: {e}")
-
-asyncio.run(test_tools())
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
-    
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ MCP tools test failed: {stderr}")
-        return False
-
-def test_kaggle_download():
-    """Test actual Kaggle download"""
-    print("\n📥 Testing Kaggle dataset download...")
-    
-    test_script = '''
-import asyncio
-import sys
-sys.path.append('/app/src')
-
-import server
-
-async def test_download():
-    try:
-        result = await server.download_kaggle_dataset("yashdevladdha/uber-ride-analytics-dashboard")
-        print(f"✅ Kaggle download test: {result[:200]}...")
-    except Exception as e:
-        print(f"❌ Kaggle download failed: {e}")
-
-asyncio.run(test_download())
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
-    
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ Kaggle download test failed: {stderr}")
-        return False
-
-def test_csv_analysis_and_columns():
-    """Test CSV analysis and show all columns"""
-    print("\n📊 Testing CSV analysis and column display...")
-    
-    test_script = '''
-import asyncio
-import sys
-sys.path.append('/app/src')
-
-import server
-
-async def test_csv_analysis():
-    try:
-        # First download the dataset
-        print("📥 Downloading Kaggle dataset...")
-        download_result = await server.download_kaggle_dataset("yashdevladdha/uber-ride-analytics-dashboard")
-        print(f"Download result: {download_result[:150]}...")
-        
-        # List downloaded datasets to see what files are available
-        print("\\n📁 Listing downloaded datasets...")
-        datasets_result = await server.list_downloaded_datasets()
-        print(f"Datasets: {datasets_result}")
-        
-        # Try to import a CSV file (we'll need to find the actual filename)
-        # For now, let's just show the download was successful
-        print("\\n✅ CSV analysis test completed - dataset downloaded successfully")
-        
-    except Exception as e:
-        print(f"❌ CSV analysis failed: {e}")
-
-asyncio.run(test_csv_analysis())
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
-    
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ CSV analysis test failed: {stderr}")
-        return False
-
-def test_data_import_with_columns():
-    """Test data import and display all columns"""
-    print("\n📈 Testing data import with column display...")
-    
-    test_script = '''
-import asyncio
-import sys
-sys.path.append('/app/src')
-
-import server
-
-async def test_import_with_columns():
-    try:
-        # Try to import a CSV file from the downloaded dataset
-        # We'll use a generic approach to find and import CSV files
-        print("📥 Attempting to import CSV data...")
-        
-        # First, let's see what tables exist
-        tables_result = await server.list_tables()
-        print(f"\\n📋 Current tables: {tables_result}")
-        
-        # Try to import a sample CSV (this might fail if no CSV files are found)
-        try:
-            import_result = await server.import_kaggle_csv(
-                "yashdevladdha/uber-ride-analytics-dashboard", 
-                "uber_data.csv", 
-                "uber_rides"
-            )
-            print(f"\\n📊 Import result: {import_result}")
-            
-            # Get table info to show columns
-            table_info = await server.get_table_info("uber_rides")
-            print(f"\\n📋 Table structure: {table_info}")
-            
-            # Query some data to show columns in action
-            query_result = await server.query_data("uber_rides", 3)
-            print(f"\\n📊 Sample data with columns: {query_result}")
-            
-        except Exception as import_error:
-            print(f"\\n⚠️ Import failed (expected if no CSV files found): {import_error}")
-            print("This is normal - the dataset might not have CSV files or they might have different names")
-        
-        print("\\n✅ Data import test completed")
-        
-    except Exception as e:
-        print(f"❌ Data import test failed: {e}")
-
-asyncio.run(test_import_with_columns())
-'''
-    
-    success, stdout, stderr = run_docker_command([
-        "poetry", "run", "python", "-c", test_script
-    ])
+async def run_tests_in_container(test_names, limit):
+    """Run the named runner tests in a single container exec.
+    
+    Returns {name: (passed, output, stderr)}; tests the runner never finished
+    (crash or timeout) are reported as failed with the exec's stderr.
+    """
+    with open(RUNNER_PATH, encoding="utf-8") as f:
+        runner_source = f.read()
+    
+    # The runner is piped to `python -`, so the image does not need the tests directory
+    async with limit:
+        _, stdout, stderr = await run_docker_command(
+            ["poetry", "run", "python", "-"] + test_names,
+            input=runner_source,
+            timeout=30 * len(test_names)
+        )
     
-    if success:
-        print(stdout)
-        return True
-    else:
-        print(f"❌ Data import test failed: {stderr}")
-        return False
+    results = {}
+    current, lines = None, []
+    for line in stdout.splitlines():
+        if line.startswith("@@TEST "):
+            current, lines = line[7:], []
+        elif line.startswith("@@DONE ") and current:
+            results[current] = (line.endswith(" ok"), "\n".join(lines) + "\n", "")
+            current = None
+        elif current:
+            lines.append(line)
+    
+    for name in test_names:
+        if name not in results:
+            results[name] = (False, "", stderr or "Runner exited before finishing this test")
+    return results
 
 def check_container_status():
     """Check if containers are running"""
     print("🐳 Checking container status...")
     
     try:
-        result = subprocess.run(
-            ["docker-compose", "ps"],
-            capture_output=True,
-            text=True
-        )
-        
-        if "mcp-server" in result.stdout and "Up" in result.stdout:
+        if not missing_containers(["mcp-server"]):
             print("✅ MCP server container is running")
             return True
         else:
@@ -311,7 +101,7 @@ def check_container_status():
         print(f"❌ Failed to check container status: {e}")
         return False
 
-def main():
+async def main():
     """Main test function"""
     print("🚀 Starting Docker-based MCP Server Tests...")
     print("="*50)
@@ -320,24 +110,23 @@ def main():
     if not check_container_status():
         return
     
-    tests = [
-        ("Database Connection", test_database_connection),
-        ("CSV Importer", test_csv_importer),
-        ("Kaggle Downloader", test_kaggle_downloader),
-        ("MCP Tools", test_mcp_tools),
-        ("Kaggle Download", test_kaggle_download),
-        ("CSV Analysis & Columns", test_csv_analysis_and_columns),
-        ("Data Import with Columns", test_data_import_with_columns),
-    ]
+    # One exec per group (Poetry, the interpreter and the server imports start once
+    # per group) and the groups overlap
+    limit = asyncio.Semaphore(MAX_PARALLEL_EXECS)
+    outputs = {}
+    for group_outputs in await asyncio.gather(*(run_tests_in_container(group, limit) for group in TEST_GROUPS)):
+        outputs.update(group_outputs)
     
     results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+    for test_name, name, progress, label in TESTS:
+        print(progress)
+        passed, stdout, stderr = outputs[name]
+        if passed:
+            print(stdout)
+        else:
+            print(stdout, end="")
+            print(f"❌ {label} failed: {stderr}")
+        results.append((test_name, passed))
     
     # Summary
     print("\n" + "="*50)
@@ -359,4 +148,4 @@ def main():
         print("⚠️ Some tests failed. Check the errors above.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -5,12 +5,13 @@ Simple command-line interface to test MCP tools
 """
 
 import asyncio
-import json
 import subprocess
 import sys
 import os
 from typing import Dict, Any
 
+from _jsonrpc import dumps_bytes, loads_bytes
+
 class InteractiveMCPClient:
     def __init__(self):
         self.server_process = None
@@ -18,22 +19,23 @@ class InteractiveMCPClient:
     async def start_server(self):
         """Start the MCP server"""
         try:
-            # Try Docker first, fallback to local
+            # Try Docker first, fallback to local. The server lives across menu choices and
+            # nothing reads its stderr, so discard it: a full stderr pipe would block the server
             try:
                 self.server_process = await asyncio.create_subprocess_exec(
                     "docker-compose", "exec", "-T", "server", "poetry", "run", "python", "src/server.py",
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+                    stderr=asyncio.subprocess.DEVNULL
                 )
                 print("✅ Started MCP server via Docker")
-            except:
+            except (FileNotFoundError, OSError):
                 # Fallback to local execution
                 self.server_process = await asyncio.create_subprocess_exec(
                     "poetry", "run", "python", "src/server.py",
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+                    stderr=asyncio.subprocess.DEVNULL
                 )
                 print("✅ Started MCP server locally")
             
@@ -42,6 +44,12 @@ class InteractiveMCPClient:
             print(f"❌ Failed to start server: {e}")
             return False
     
+    async def ensure_server(self) -> bool:
+        """Start the MCP server unless one is already running"""
+        if self.server_process is None or self.server_process.returncode is not None:
+            return await self.start_server()
+        return True
+    
     async def send_mcp_request(self, method: str, params: Dict[str, Any] = None) -> str:
         """Send a request to the MCP server and return the response"""
         if not self.server_process:
@@ -55,13 +63,12 @@ class InteractiveMCPClient:
         }
         
         try:
-            request_json = json.dumps(request) + "\n"
-            self.server_process.stdin.write(request_json.encode())
+            self.server_process.stdin.write(dumps_bytes(request) + b"\n")
             await self.server_process.stdin.drain()
             
             response_line = await self.server_process.stdout.readline()
             if response_line:
-                response = json.loads(response_line.decode().strip())
+                response = loads_bytes(response_line)
                 if "result" in response and "content" in response["result"]:
                     return response["result"]["content"][0].get("text", "No content")
                 elif "error" in response:
@@ -114,7 +121,7 @@ class InteractiveMCPClient:
         """Run a quick test of basic functionality"""
         print("🚀 Running quick MCP server test...")
         
-        if not await self.start_server():
+        if not await self.ensure_server():
             return
         
         try:
@@ -127,16 +134,14 @@ class InteractiveMCPClient:
             
         except Exception as e:
             print(f"❌ Test failed: {e}")
-        
-        finally:
-            await self.cleanup()
     
     async def cleanup(self):
         """Clean up the server process"""
-        if self.server_process:
+        if self.server_process and self.server_process.returncode is None:
             self.server_process.terminate()
             await self.server_process.wait()
             print("🧹 Server process cleaned up")
+        self.server_process = None
 
 def print_menu():
     """Print the interactive menu"""
@@ -156,45 +161,44 @@ async def main():
     """Main interactive function"""
     client = InteractiveMCPClient()
     
-    while True:
-        print_menu()
-        choice = input("\nEnter your choice (0-6): ").strip()
-        
-        if choice == "0":
-            print("👋 Goodbye!")
-            break
-        elif choice == "1":
-            await client.run_quick_test()
-        elif choice == "2":
-            if await client.start_server():
-                await client.test_database_connection()
-                await client.cleanup()
-        elif choice == "3":
-            if await client.start_server():
-                await client.test_kaggle_download()
-                await client.cleanup()
-        elif choice == "4":
-            if await client.start_server():
-                await client.test_list_tables()
-                await client.cleanup()
-        elif choice == "5":
-            if await client.start_server():
-                await client.test_list_datasets()
-                await client.cleanup()
-        elif choice == "6":
-            tool_name = input("Enter tool name: ").strip()
-            if tool_name:
-                if await client.start_server():
-                    result = await client.send_mcp_request("tools/call", {
-                        "name": tool_name,
-                        "arguments": {}
-                    })
-                    print(f"Result: {result}")
-                    await client.cleanup()
-        else:
-            print("❌ Invalid choice. Please try again.")
-        
-        input("\nPress Enter to continue...")
+    # One server process serves every menu choice; it is restarted only if it exits
+    try:
+        while True:
+            print_menu()
+            choice = input("\nEnter your choice (0-6): ").strip()
+            
+            if choice == "0":
+                print("👋 Goodbye!")
+                break
+            elif choice == "1":
+                await client.run_quick_test()
+            elif choice == "2":
+                if await client.ensure_server():
+                    await client.test_database_connection()
+            elif choice == "3":
+                if await client.ensure_server():
+                    await client.test_kaggle_download()
+            elif choice == "4":
+                if await client.ensure_server():
+                    await client.test_list_tables()
+            elif choice == "5":
+                if await client.ensure_server():
+                    await client.test_list_datasets()
+            elif choice == "6":
+                tool_name = input("Enter tool name: ").strip()
+                if tool_name:
+                    if await client.ensure_server():
+                        result = await client.send_mcp_request("tools/call", {
+                            "name": tool_name,
+                            "arguments": {}
+                        })
+                        print(f"Result: {result}")
+            else:
+                print("❌ Invalid choice. Please try again.")
+            
+            input("\nPress Enter to continue...")
+    finally:
+        await client.cleanup()
 
 if __name__ == "__main__":
     try:
@@ -37,12 +37,15 @@ async def test_database_connection():
         from models import get_database_engine
         from sqlalchemy import text
         
-        engine = get_database_engine()
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT version();"))
-            version = result.scalar()
-            print(f"✅ Database connected: {version}")
-            return True
+        def fetch_version():
+            engine = get_database_engine()
+            with engine.connect() as conn:
+                return conn.execute(text("SELECT version();")).scalar()
+        
+        # Off the event loop so the other tests can run meanwhile
+        version = await asyncio.to_thread(fetch_version)
+        print(f"✅ Database connected: {version}")
+        return True
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         return False
@@ -54,7 +57,7 @@ async def test_csv_importer():
     try:
         from csv_importer import CSVImporter
         
-        importer = CSVImporter()
+        importer = await asyncio.to_thread(CSVImporter)
         print("✅ CSV importer initialized")
         return True
     except Exception as e:
@@ -68,7 +71,7 @@ async def test_kaggle_downloader():
     try:
         from kaggle_downloader import KaggleDownloader
         
-        downloader = KaggleDownloader()
+        downloader = await asyncio.to_thread(KaggleDownloader)
         print("✅ Kaggle downloader initialized")
         return True
     except Exception as e:
@@ -110,14 +113,15 @@ async def run_all_tests():
         ("MCP Tools", test_mcp_tools),
     ]
     
+    # The tests share no state, so run them concurrently
+    outcomes = await asyncio.gather(*(test_func() for _, test_func in tests), return_exceptions=True)
+    
     results = []
-    for test_name, test_func in tests:
-        try:
-            result = await test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+    for (test_name, _), result in zip(tests, outcomes):
+        if isinstance(result, Exception):
+            print(f"❌ {test_name} test crashed: {result}")
+            result = False
+        results.append((test_name, result))
     
     # Summary
     print("\n" + "="*50)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for CSVImporter's binary COPY encoding
+Needs a reachable PostgreSQL in DATABASE_URL; skipped otherwise
+Run with: python -m unittest tests/test_binary_copy.py (or pytest)
+"""
+
+import datetime
+import os
+import sys
+import unittest
+import uuid
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+load_dotenv()
+
+import pandas as pd
+from sqlalchemy import text
+
+from csv_importer import CSVImporter, quote_ident
+
+
+def _importer():
+    """Connected importer, or None when no database is reachable"""
+    if not os.getenv("DATABASE_URL"):
+        return None
+    try:
+        importer = CSVImporter()
+        with importer.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return importer
+    except Exception:
+        return None
+
+
+IMPORTER = _importer()
+
+
+@unittest.skipIf(IMPORTER is None, "DATABASE_URL not set or database unreachable")
+class BinaryCopyRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.table = f"binary_copy_{uuid.uuid4().hex[:8]}"
+
+    def tearDown(self):
+        with IMPORTER.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {quote_ident(self.table)}"))
+
+    def test_object_columns_round_trip(self):
+        # Object columns to_sql types as BIGINT / DATE / BOOLEAN, e.g. frames read back from SQL
+        df = pd.DataFrame({
+            "ints": pd.Series([1, None, 3], dtype=object),
+            "dates": [datetime.date(2024, 1, 1), None, datetime.date(1999, 12, 31)],
+            "flags": pd.Series([True, None, False], dtype=object),
+        })
+        IMPORTER.import_dataframe(df, self.table)
+
+        info = IMPORTER.get_table_info(self.table, exact=True)
+        self.assertEqual([c["type"] for c in info["columns"]], ["bigint", "date", "boolean"])
+        self.assertEqual(
+            IMPORTER.query_table(self.table, limit=3),
+            [
+                {"ints": 1, "dates": datetime.date(2024, 1, 1), "flags": True},
+                {"ints": None, "dates": None, "flags": None},
+                {"ints": 3, "dates": datetime.date(1999, 12, 31), "flags": False},
+            ],
+        )
+
+    def test_existing_table_uses_its_own_types(self):
+        with IMPORTER.engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE {quote_ident(self.table)} (ints text, dates date, flags boolean)"))
+        df = pd.DataFrame({
+            "ints": pd.Series([7, None], dtype=object),
+            "dates": [datetime.date(2024, 2, 29), None],
+            "flags": pd.Series([None, True], dtype=object),
+        })
+        IMPORTER.import_dataframe(df, self.table)
+
+        self.assertEqual(
+            IMPORTER.query_table(self.table, limit=2),
+            [
+                {"ints": "7", "dates": datetime.date(2024, 2, 29), "flags": None},
+                {"ints": None, "dates": None, "flags": True},
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,93 +5,167 @@ This client can be used to test all MCP tools without needing a full MCP client
 """
 
 import asyncio
-import json
+import itertools
 import subprocess
 import sys
 from typing import Dict, Any, List
 import argparse
 
+from _jsonrpc import dumps_bytes, loads_bytes
+
+# Large tool responses (full column dumps, query rows) arrive as one JSON line:
+# let the StreamReader buffer up to 4 MiB
+STREAM_LIMIT_BYTES = 4 * 1024 * 1024
+NO_CONTENT = "No content"
+
 class MCPTestClient:
     def __init__(self, server_command: List[str] = None):
         """Initialize the test client with server command"""
         self.server_command = server_command or ["docker-compose", "exec", "server", "poetry", "run", "python", "src/server.py"]
         self.process = None
+        # Requests are multiplexed: each id maps to a future the reader task resolves
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = None
     
     async def start_server(self):
-        """Start the MCP server process"""
+        """Start the MCP server process (no-op when it is already running)"""
+        if self.process:
+            return True
         try:
             self.process = await asyncio.create_subprocess_exec(
                 *self.server_command,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT_BYTES
             )
+            self._reader = asyncio.create_task(self._read_responses())
             print("✅ MCP Server started successfully")
             return True
         except Exception as e:
             print(f"❌ Failed to start MCP server: {e}")
             return False
     
-    async def send_request(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send a request to the MCP server"""
-        if not self.process:
-            raise RuntimeError("Server not started")
-        
+    async def _read_responses(self):
+        """Route each response line to the future waiting on its id"""
+        try:
+            while True:
+                response_line = await self.process.stdout.readline()
+                if not response_line:
+                    break
+                try:
+                    response = loads_bytes(response_line)
+                except ValueError:
+                    continue
+                # Notifications (and stray lines) have no pending id
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result({"error": "No response from server"})
+            self._pending.clear()
+    
+    def _frame(self, method: str, params: Dict[str, Any] = None):
+        """Register a pending future and return (future, request bytes)"""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         request = {
             "jsonrpc": "2.0",
-            "id": 1,
+            "id": request_id,
             "method": method,
             "params": params or {}
         }
+        return future, dumps_bytes(request) + b"\n"
+    
+    async def send_request(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a request to the MCP server"""
+        if not self.process:
+            raise RuntimeError("Server not started")
         
-        request_json = json.dumps(request) + "\n"
-        
+        future, frame = self._frame(method, params)
         try:
-            self.process.stdin.write(request_json.encode())
+            self.process.stdin.write(frame)
             await self.process.stdin.drain()
-            
-            # Read response
-            response_line = await self.process.stdout.readline()
-            if response_line:
-                response = json.loads(response_line.decode().strip())
-                return response
-            else:
-                return {"error": "No response from server"}
-                
+            return await future
         except Exception as e:
             return {"error": f"Request failed: {e}"}
     
+    async def send_batch(self, calls: List[tuple]) -> List[Dict[str, Any]]:
+        """Pipeline (method, params) requests in one write and await all the responses.
+        
+        Responses are returned in call order, matched back up by request id.
+        """
+        if not self.process:
+            raise RuntimeError("Server not started")
+        
+        futures, frames = zip(*(self._frame(method, params) for method, params in calls))
+        try:
+            # One write + one drain for the whole batch
+            self.process.stdin.write(b"".join(frames))
+            await self.process.stdin.drain()
+            return list(await asyncio.gather(*futures))
+        except Exception as e:
+            return [{"error": f"Request failed: {e}"} for _ in calls]
+    
+    @staticmethod
+    def _format_tool_response(response: Dict[str, Any]) -> str:
+        payload = response.get("result")
+        error = response.get("error")
+        if error is not None:
+            return f"❌ Error: {error}"
+        elif payload is not None:
+            content = payload.get("content") or [{}]
+            return f"✅ Success: {content[0].get('text', NO_CONTENT)}"
+        else:
+            return f"⚠️ Unexpected response: {response}"
+    
+    @staticmethod
+    def _tool_report(tool_name: str, kwargs: Dict[str, Any], result: str) -> str:
+        return f"\n🔧 Testing tool: {tool_name}\n📝 Parameters: {kwargs}\n📊 Result: {result}\n"
+    
     async def test_tool(self, tool_name: str, **kwargs) -> str:
         """Test a specific MCP tool"""
-        print(f"\n🔧 Testing tool: {tool_name}")
-        print(f"📝 Parameters: {kwargs}")
-        
         response = await self.send_request("tools/call", {
             "name": tool_name,
             "arguments": kwargs
         })
         
-        if "error" in response:
-            result = f"❌ Error: {response['error']}"
-        elif "result" in response:
-            result = f"✅ Success: {response['result'].get('content', [{}])[0].get('text', 'No content')}"
-        else:
-            result = f"⚠️ Unexpected response: {response}"
-        
-        print(f"📊 Result: {result}")
+        # One write per tool call; concurrent calls cannot interleave their lines
+        result = self._format_tool_response(response)
+        sys.stdout.write(self._tool_report(tool_name, kwargs, result))
+        sys.stdout.flush()
         return result
     
+    async def test_tools(self, calls: List[tuple]) -> List[str]:
+        """Test several independent (tool_name, arguments) calls in one pipelined batch"""
+        responses = await self.send_batch([
+            ("tools/call", {"name": tool_name, "arguments": kwargs})
+            for tool_name, kwargs in calls
+        ])
+        
+        results = [self._format_tool_response(response) for response in responses]
+        sys.stdout.write("".join(
+            self._tool_report(tool_name, kwargs, result)
+            for (tool_name, kwargs), result in zip(calls, results)
+        ))
+        sys.stdout.flush()
+        return results
+    
     async def list_tools(self) -> List[str]:
         """List available tools"""
         print("\n📋 Listing available tools...")
         
         response = await self.send_request("tools/list")
         
-        if "result" in response and "tools" in response["result"]:
-            tools = [tool["name"] for tool in response["result"]["tools"]]
-            print(f"✅ Found {len(tools)} tools:")
-            for tool in tools:
-                print(f"  - {tool}")
+        listed = (response.get("result") or {}).get("tools")
+        if listed is not None:
+            tools = [tool["name"] for tool in listed]
+            sys.stdout.write(f"✅ Found {len(tools)} tools:\n" + "".join(f"  - {tool}\n" for tool in tools))
+            sys.stdout.flush()
             return tools
         else:
             print(f"❌ Failed to list tools: {response}")
@@ -101,10 +175,6 @@ class MCPTestClient:
         """Run a comprehensive test of all MCP tools"""
         print("🚀 Starting comprehensive MCP server test...")
         
-        # Start server
-        if not await self.start_server():
-            return
-        
         try:
             # List available tools
             tools = await self.list_tools()
@@ -113,18 +183,16 @@ class MCPTestClient:
                 print("❌ No tools found, stopping test")
                 return
             
-            # Test basic database connection
-            await self.test_tool("test_db_connection")
-            
-            # Test listing tables (should be empty initially)
-            await self.test_tool("list_tables")
-            
-            # Test Kaggle dataset download
-            print("\n📥 Testing Kaggle dataset download...")
-            await self.test_tool("download_kaggle_dataset", 
-                               dataset_name="yashdevladdha/uber-ride-analytics-dashboard")
+            # Connection check, table listing and the Kaggle download are independent,
+            # so they go out together and their responses are awaited concurrently
+            print("\n📥 Testing database + Kaggle dataset download...")
+            await self.test_tools([
+                ("test_db_connection", {}),
+                ("list_tables", {}),
+                ("download_kaggle_dataset", {"dataset_name": "yashdevladdha/uber-ride-analytics-dashboard"}),
+            ])
             
-            # List downloaded datasets
+            # List downloaded datasets (after the download has finished)
             await self.test_tool("list_downloaded_datasets")
             
             # Test CSV analysis (if we have a local CSV file)
@@ -136,17 +204,36 @@ class MCPTestClient:
             
         except Exception as e:
             print(f"❌ Test failed: {e}")
-        
-        finally:
-            await self.cleanup()
     
     async def cleanup(self):
         """Clean up the server process"""
         if self.process:
             self.process.terminate()
             await self.process.wait()
+            if self._reader:
+                await self._reader
+            self.process = None
+            self._reader = None
             print("🧹 Server process cleaned up")
 
+async def _with_server(client: MCPTestClient, coro):
+    """Run coro against one server instance, starting it if needed and always cleaning up"""
+    try:
+        if not await client.start_server():
+            coro.close()
+            return None
+        return await coro
+    finally:
+        await client.cleanup()
+
+def _parse_tool_arg(tool: str):
+    """Split `name=value` into the tool name and its arguments (simple implementation)"""
+    if "=" in tool:
+        tool_name, params = tool.split("=", 1)
+        # Simple parameter parsing - you can extend this
+        return tool_name, {"dataset_name": params}
+    return tool, {}
+
 async def main():
     """Main function to run the test client"""
     parser = argparse.ArgumentParser(description="Test client for MCP server")
@@ -165,35 +252,32 @@ async def main():
     
     client = MCPTestClient(server_command)
     
+    tool_name, tool_args = _parse_tool_arg(args.tool) if args.tool else (None, {})
+    actions = {
+        "comprehensive": client.run_comprehensive_test,
+        "list": client.list_tools,
+        "tool": lambda: client.test_tool(tool_name, **tool_args),
+    }
+    selected = [name for name in actions if getattr(args, name)]
+    
+    if not selected:
+        print("🔧 MCP Test Client")
+        print("Usage:")
+        print("  python test_client.py --comprehensive    # Run full test suite")
+        print("  python test_client.py --list            # List available tools")
+        print("  python test_client.py --tool test_db_connection  # Test specific tool")
+        print("  python test_client.py --local           # Run server locally")
+        print("\nExample:")
+        print("  python test_client.py --tool download_kaggle_dataset=yashdevladdha/uber-ride-analytics-dashboard")
+        return
+    
+    async def run_selected():
+        # Every selected action shares the one server process
+        for name in selected:
+            await actions[name]()
+    
     try:
-        if args.comprehensive:
-            await client.run_comprehensive_test()
-        elif args.list:
-            await client.start_server()
-            await client.list_tools()
-            await client.cleanup()
-        elif args.tool:
-            await client.start_server()
-            # Parse tool arguments (simple implementation)
-            tool_args = {}
-            if "=" in args.tool:
-                tool_name, params = args.tool.split("=", 1)
-                # Simple parameter parsing - you can extend this
-                tool_args = {"dataset_name": params}
-            else:
-                tool_name = args.tool
-            
-            await client.test_tool(tool_name, **tool_args)
-            await client.cleanup()
-        else:
-            print("🔧 MCP Test Client")
-            print("Usage:")
-            print("  python test_client.py --comprehensive    # Run full test suite")
-            print("  python test_client.py --list            # List available tools")
-            print("  python test_client.py --tool test_db_connection  # Test specific tool")
-            print("  python test_client.py --local           # Run server locally")
-            print("\nExample:")
-            print("  python test_client.py --tool download_kaggle_dataset=yashdevladdha/uber-ride-analytics-dashboard")
+        await _with_server(client, run_selected())
     
     except KeyboardInterrupt:
         print("\n⏹️ Test interrupted by user")
@@ -201,4 +285,11 @@ async def main():
         print(f"❌ Test failed: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop makes the many small pipe reads/writes cheaper, but stays optional;
+    # uvloop.run supplies the loop factory, as the server does
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,28 +1,150 @@
 import os
 import json
-import pandas as pd
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from flask import request
+from html import escape
 
-from vanna.chromadb import ChromaDB_VectorStore
-from vanna.google import GoogleGeminiChat
-from vanna.flask import VannaFlaskApp
+from _vanna_common import TRAINING_EXAMPLES, build_view_ddl, pick_uber_table, to_snake_case
 
+# vanna (ChromaDB, onnxruntime, Gemini SDK) and pandas cost seconds and hundreds of MB at import,
+# so they load on first use; MyVanna stays importable through the module __getattr__ below
+
+# connectorx reads results straight into columnar pandas buffers (Rust, no per-row tuples). Opt-in:
+# it opens its own connection per query and returns NUMERIC as float64 (pandas gives Decimal), so it
+# is only used when CONNECTORX_MIN_ROWS is set and the planner expects at least that many rows.
+# Every single-statement query then pays an EXPLAIN round trip on the pooled connection, and one
+# that passes the threshold is planned again on connectorx's fresh connection
+try:
+	import connectorx as cx
+except ImportError:
+	cx = None
+CONNECTORX_MIN_ROWS = int(os.getenv("CONNECTORX_MIN_ROWS", "0") or 0)
+
+
+# Documentation trained with the shared examples so the UI prefers Uber data
+TRAINING_DOCUMENTATION = (
+	"Uber bookings: Each row is a ride booking with timestamps, status, locations, ride distance, booking value, ratings, and payment method."
+)
+TRAIN_WORKERS = 8
+
+
+@lru_cache(maxsize=None)
+def _vanna_class():
+	from vanna.chromadb import ChromaDB_VectorStore
+	from vanna.google import GoogleGeminiChat
+
+	class MyVanna(ChromaDB_VectorStore, GoogleGeminiChat):
+		def __init__(self, api_key: str, model: str):
+			# Use a dedicated collection to avoid mixing old 'sales' training with Uber
+			ChromaDB_VectorStore.__init__(
+				self,
+				config={
+					"collection_name": os.getenv("VANNA_COLLECTION", "uber_vanna"),
+					# Pin the on-disk store so every worker opens the same index instead of depending on cwd
+					"path": os.getenv("CHROMA_PATH", "."),
+				}
+			)
+			GoogleGeminiChat.__init__(self, config={"api_key": api_key, "model": model})
+
+	return MyVanna
+
+
+def __getattr__(name: str):
+	if name == "MyVanna":
+		return _vanna_class()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def _train_all(vn: "MyVanna", items: list[dict]) -> None:
+	# vn.train is blocking (Gemini embedding + Chroma upsert), so overlap the calls on a thread pool
+	loop = asyncio.get_running_loop()
+	with ThreadPoolExecutor(max_workers=TRAIN_WORKERS) as pool:
+		await asyncio.gather(*(loop.run_in_executor(pool, partial(vn.train, **item)) for item in items))
+
+
+def _train_batched(vn: "MyVanna", items: list[dict]) -> bool:
+	# One embedding call and one collection.add per Chroma collection instead of one per vn.train,
+	# with the same documents and ids vn.train would write; False when the store lacks these internals
+	try:
+		from vanna.utils import deterministic_uuid
+
+		batches = {}
+		for item in items:
+			if "sql" in item:
+				doc = json.dumps({"question": item["question"], "sql": item["sql"]}, ensure_ascii=False)
+				key = (vn.sql_collection, "-sql")
+			elif "ddl" in item:
+				doc, key = item["ddl"], (vn.ddl_collection, "-ddl")
+			else:
+				doc, key = item["documentation"], (vn.documentation_collection, "-doc")
+			batches.setdefault(key, []).append(doc)
+
+		for (collection, suffix), docs in batches.items():
+			collection.add(
+				documents=docs,
+				embeddings=vn.embedding_function(docs),
+				ids=[deterministic_uuid(doc) + suffix for doc in docs],
+			)
+		return True
+	except (ImportError, AttributeError):
+		return False
+
+
+def _training_fingerprint(items: list[dict]) -> str:
+	return hashlib.sha256(json.dumps(items, sort_keys=True).encode()).hexdigest()
+
+
+def _fingerprint_path() -> str:
+	# Kept next to the Chroma store, outside the retrievable training data, one file per collection
+	collection = os.getenv("VANNA_COLLECTION", "uber_vanna")
+	return os.path.join(os.getenv("CHROMA_PATH", "."), f".{collection}.training_fingerprint")
+
+
+def _already_trained(vn: "MyVanna", fingerprint: str) -> bool:
+	try:
+		with open(_fingerprint_path(), encoding="utf-8") as f:
+			if f.read().strip() != fingerprint:
+				return False
+	except OSError:
+		return False
+	# A wiped or replaced store needs retraining even if the marker file survived
+	collection = getattr(vn, "sql_collection", None)
+	try:
+		return collection is None or collection.count() > 0
+	except Exception:
+		return False
+
+
+def _record_fingerprint(fingerprint: str) -> None:
+	path = _fingerprint_path()
+	try:
+		os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+		with open(path, "w", encoding="utf-8") as f:
+			f.write(fingerprint)
+	except OSError as e:
+		print(f"[Vanna Flask] Could not record training fingerprint: {e}")
 
-class MyVanna(ChromaDB_VectorStore, GoogleGeminiChat):
-	def __init__(self, api_key: str, model: str):
-		# Use a dedicated collection to avoid mixing old 'sales' training with Uber
-		ChromaDB_VectorStore.__init__(
-			self,
-			config={
-				"collection_name": os.getenv("VANNA_COLLECTION", "uber_vanna"),
-			}
-		)
-		GoogleGeminiChat.__init__(self, config={"api_key": api_key, "model": model})
 
+def _drop_legacy_fingerprint_docs(vn: "MyVanna") -> None:
+	# Earlier versions trained the marker as documentation, where it leaked into every prompt
+	try:
+		data = vn.get_training_data()
+		if data is None or data.empty:
+			return
+		for entry_id in data.loc[data["content"].astype(str).str.startswith("fingerprint:"), "id"]:
+			vn.remove_training_data(entry_id)
+	except Exception:
+		pass
 
-def create_vanna_with_pg() -> tuple[MyVanna, str]:
+
+def create_vanna_with_pg() -> tuple["MyVanna", str]:
 	load_dotenv()
 
 	gemini_api_key = os.getenv("GEMINI_API") or os.getenv("GEMINI_API_KEY")
@@ -42,13 +164,41 @@ def create_vanna_with_pg() -> tuple[MyVanna, str]:
 	print(f"[Vanna Flask] DATABASE_URL= {database_url}")
 	print(f"[Vanna Flask] GEMINI_MODEL= {gemini_model}")
 
-	vn = MyVanna(api_key=gemini_api_key, model=gemini_model)
+	vn = _vanna_class()(api_key=gemini_api_key, model=gemini_model)
+
+	# Warm pool sized for bursts of UI and /vega queries; LIFO keeps the hottest connections in use
+	engine = create_engine(
+		database_url,
+		pool_size=10,
+		max_overflow=20,
+		pool_pre_ping=True,
+		pool_recycle=300,
+		pool_use_lifo=True,
+	)
 
-	engine = create_engine(database_url)
+	# connectorx takes a plain postgresql:// URL without the SQLAlchemy driver suffix
+	cx_url = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+	use_cx = cx is not None and CONNECTORX_MIN_ROWS > 0
 
 	# Attach run_sql so UI can execute queries
 	def run_sql(sql: str):
+		import pandas as pd
 		with engine.connect() as conn:
+			if use_cx:
+				# The planner's estimate on the warm pooled connection decides; small results skip
+				# connectorx's per-query connection. Plain EXPLAIN of a single statement runs nothing,
+				# but the driver would execute every statement of "SELECT ...; DELETE ...", so anything
+				# with a ";" before the end skips the probe. A statement EXPLAIN rejects (invalid SQL,
+				# SHOW, ...) still executes exactly once, below
+				statement = sql.strip().rstrip(";")
+				if ";" not in statement:
+					try:
+						plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement).scalar()
+					except DBAPIError:
+						conn.rollback()
+					else:
+						if plan[0]["Plan"]["Plan Rows"] >= CONNECTORX_MIN_ROWS:
+							return cx.read_sql(cx_url, sql, return_type="pandas")
 			return pd.read_sql_query(sql, conn)
 
 	vn.run_sql = run_sql
@@ -64,96 +214,123 @@ def create_vanna_with_pg() -> tuple[MyVanna, str]:
 			WHERE table_schema='public' AND table_type='BASE TABLE'
 			"""
 		)).fetchall()}
-		if preferred and preferred in available:
-			target_table = preferred
-		elif "ncr_ride_bookings" in available:
-			target_table = "ncr_ride_bookings"
-		elif "uber_rides" in available:
-			target_table = "uber_rides"
-		else:
-			matches = [t for t in available if ("uber" in t.lower() or "ride" in t.lower())]
-			target_table = matches[0] if matches else None
+		target_table = pick_uber_table(available, preferred)
 
-		if target_table:
-			cols = conn.execute(text(
-				"""
-				SELECT column_name
-				FROM information_schema.columns
-				WHERE table_schema='public' AND table_name=:t
-				ORDER BY ordinal_position
-				"""
-			), {"t": target_table}).fetchall()
+		# One introspection pass: the view only renames columns, so its types are the source types.
+		# Without a source table, fall back to an existing uber_bookings view.
+		cols = conn.execute(text(
+			"""
+			SELECT column_name, data_type
+			FROM information_schema.columns
+			WHERE table_schema='public' AND table_name=:t
+			ORDER BY ordinal_position
+			"""
+		), {"t": target_table or "uber_bookings"}).fetchall()
+		ddl_cols = cols
 
+		if target_table:
 			print(f"[Vanna Flask] Using Uber table: {target_table}")
 
-			import re
-			def to_snake_case(name: str) -> str:
-				s = name.strip().lower()
-				s = re.sub(r"[^a-z0-9]+", "_", s)
-				s = re.sub(r"_+", "_", s).strip("_")
-				return s or "col"
-
 			select_list = []
-			for (col_name,) in cols:
-				select_list.append(f'"{col_name}" AS {to_snake_case(col_name)}')
+			ddl_cols = []
+			for col_name, data_type in cols:
+				snake = to_snake_case(col_name)
+				select_list.append(f'"{col_name}" AS {snake}')
+				ddl_cols.append((snake, data_type))
 
 			view_sql = "CREATE OR REPLACE VIEW uber_bookings AS SELECT " + ", ".join(select_list) + f" FROM {target_table};"
-			conn.execute(text(view_sql))
-			# Basic counts for verification
-			base_count = conn.execute(text(f"SELECT COUNT(*) FROM {target_table}"))
-			base_count_val = base_count.scalar() or 0
-			view_count = conn.execute(text("SELECT COUNT(*) FROM uber_bookings"))
-			view_count_val = view_count.scalar() or 0
-			print(f"[Vanna Flask] Row counts -> {target_table}: {base_count_val}, uber_bookings: {view_count_val}")
+			# Recreate the view only when the source table or its columns changed since the last start
+			view_sig = hashlib.md5(view_sql.encode()).hexdigest()
+			conn.execute(text("CREATE TABLE IF NOT EXISTS vanna_meta (key text PRIMARY KEY, value text)"))
+			stored_sig, view_exists = conn.execute(text(
+				"SELECT (SELECT value FROM vanna_meta WHERE key = 'uber_view_sig'), to_regclass('uber_bookings') IS NOT NULL"
+			)).one()
+			if stored_sig == view_sig and view_exists:
+				print("[Vanna Flask] uber_bookings view is up to date")
+			else:
+				conn.execute(text(view_sql))
+				conn.execute(text(
+					"INSERT INTO vanna_meta (key, value) VALUES ('uber_view_sig', :v) "
+					"ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value"
+				), {"v": view_sig})
+			# Planner estimate instead of COUNT(*): the view is a plain projection, so it has the same rows
+			if not os.getenv("SKIP_ROW_COUNT"):
+				estimate = conn.execute(text(
+					"SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"
+				), {"t": target_table}).scalar()
+				shown = f"~{estimate}" if estimate is not None and estimate >= 0 else "unknown (not analyzed yet)"
+				print(f"[Vanna Flask] Row estimate -> {target_table} / uber_bookings: {shown}")
 
 	# Train DDL for the view and a few examples so the UI prefers Uber data
-	with engine.connect() as conn2:
-		ddl_cols = conn2.execute(text(
-			"""
-			SELECT column_name, data_type
-			FROM information_schema.columns
-			WHERE table_schema='public' AND table_name=:v
-			ORDER BY ordinal_position
-			"""
-		), {"v": "uber_bookings"}).fetchall()
-
-		if ddl_cols:
-			mapped_lines = []
-			for col_name, data_type in ddl_cols:
-				mapped = "text"
-				if "double" in data_type or data_type in ("numeric", "real"):
-					mapped = "double precision"
-				elif data_type in ("integer", "bigint", "smallint"):
-					mapped = "integer"
-				elif "timestamp" in data_type or data_type == "date":
-					mapped = data_type
-				mapped_lines.append(f"\t\t{col_name} {mapped}")
-			ddl_sql = "CREATE TABLE uber_bookings (\n" + ",\n".join(mapped_lines) + "\n\t)"
-			vn.train(ddl=ddl_sql)
-
-			vn.train(documentation=(
-				"Uber bookings: Each row is a ride booking with timestamps, status, locations, ride distance, booking value, ratings, and payment method."
-			))
-			vn.train(question="How many total rides are there?", sql="SELECT COUNT(*) AS total_rides FROM uber_bookings;")
-			vn.train(question="How many completed rides by day?", sql=(
-				"SELECT date::date AS ride_date, COUNT(*) AS completed_rides "
-				"FROM uber_bookings WHERE lower(booking_status) = 'completed' "
-				"GROUP BY date::date ORDER BY ride_date;"
-			))
-			vn.train(question="What is the average ride distance per vehicle type?", sql=(
-				"SELECT vehicle_type, AVG(ride_distance) AS avg_distance FROM uber_bookings GROUP BY vehicle_type ORDER BY avg_distance DESC;"
-			))
-			vn.train(question="Top 10 pickup locations by rides", sql=(
-				"SELECT pickup_location, COUNT(*) AS rides FROM uber_bookings GROUP BY pickup_location ORDER BY rides DESC LIMIT 10;"
-			))
-			vn.train(question="Total booking value (revenue)?", sql=(
-				"SELECT SUM(booking_value) AS total_booking_value FROM uber_bookings;"
-			))
+	if ddl_cols:
+		items = [{"ddl": build_view_ddl(ddl_cols)}, {"documentation": TRAINING_DOCUMENTATION}, *TRAINING_EXAMPLES]
+		# Skip re-embedding when this exact training set is already in the collection
+		fingerprint = _training_fingerprint(items)
+		if _already_trained(vn, fingerprint):
+			print("[Vanna Flask] Training data unchanged, skipping training")
+		else:
+			_drop_legacy_fingerprint_docs(vn)
+			if not _train_batched(vn, items):
+				asyncio.run(_train_all(vn, items))
+			_record_fingerprint(fingerprint)
 
 	return vn, database_url
 
 
+# Static parts of the /vega page, encoded once; the SQL is HTML-escaped and the spec goes between them
+_VEGA_HEAD = b"""<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Vega-Lite</title>
+<script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>
+<style>
+  body { font-family: system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; }
+  #vis { max-width: 1000px; }
+  pre { white-space: pre-wrap; word-break: break-word; }
+  a { color: #0b5fff; }
+</style>
+</head>
+<body>
+<h3>Vega-Lite Chart</h3>
+<div style="margin-bottom:12px">SQL: <code>"""
+_VEGA_MID = b"""</code></div>
+<div id="vis"></div>
+<script>
+const spec = """
+_VEGA_TAIL = b""";
+vegaEmbed('#vis', spec).catch(console.error);
+</script>
+<div style="margin-top:16px"><a href="/">Back to Vanna</a></div>
+</body>
+</html>"""
+
+
+# In-page Vega-Lite panel injected into the main UI without changing templates; encoded once at import
+_VEGA_INJECTION_BYTES = """\n<!-- VEGA_PANEL_INJECTED -->\n<div id=\"vega-lite-panel\" style=\"position:fixed; right:16px; bottom:16px; width:520px; max-width:92vw; height:420px; background:#fff; border:1px solid #e3e3e3; box-shadow:0 6px 24px rgba(0,0,0,0.12); border-radius:8px; z-index:9999; display:flex; flex-direction:column;\">\n  <div style=\"display:flex; align-items:center; justify-content:space-between; padding:10px 12px; border-bottom:1px solid #eee; background:#fafafa; border-top-left-radius:8px; border-top-right-radius:8px;\">\n    <div style=\"font-weight:600; font-size:14px;\">Vega-Lite Chart</div>\n    <button id=\"vega-panel-toggle\" style=\"background:none; border:none; cursor:pointer; font-size:13px; color:#0b5fff;\">Hide</button>\n  </div>\n  <div id=\"vega-panel-body\" style=\"display:flex; flex-direction:column; gap:8px; padding:10px 12px;\">\n    <div style=\"font-size:12px; color:#333;\">Enter SQL to visualize (first column on X, second numeric column on Y; otherwise counts):</div>\n    <textarea id=\"vega-sql\" style=\"width:100%; height:80px; font-family:ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, \u0027Liberation Mono\u0027, \u0027Courier New\u0027, monospace; font-size:12px; padding:8px; border:1px solid #ddd; border-radius:6px;\" placeholder=\"SELECT vehicle_type, COUNT(*) AS rides FROM uber_bookings GROUP BY 1 ORDER BY 2 DESC LIMIT 10\"></textarea>\n    <div style=\"display:flex; gap:8px; align-items:center;\">\n      <button id=\"vega-render\" style=\"background:#0b5fff; color:#fff; border:none; padding:8px 12px; border-radius:6px; cursor:pointer; font-size:12px;\">Render</button>\n      <span id=\"vega-status\" style=\"font-size:12px; color:#666;\"></span>\n    </div>\n    <iframe id=\"vega-frame\" title=\"Vega-Lite\" style=\"flex:1; width:100%; border:1px solid #eee; border-radius:6px; background:#fff;\"></iframe>\n  </div>\n</div>\n<script>\n(function(){\n  const panel = document.getElementById('vega-lite-panel');\n  const body = document.getElementById('vega-panel-body');\n  const toggle = document.getElementById('vega-panel-toggle');\n  const btn = document.getElementById('vega-render');\n  const ta = document.getElementById('vega-sql');\n  const frame = document.getElementById('vega-frame');\n  const status = document.getElementById('vega-status');\n  if (!panel || !btn || !ta || !frame) return;\n  toggle.addEventListener('click', function(){\n    const isHidden = body.style.display === 'none';\n    body.style.display = isHidden ? 'flex' : 'none';\n    toggle.textContent = isHidden ? 'Hide' : 'Show';\n  });\n  btn.addEventListener('click', function(){\n    const sql = encodeURIComponent(ta.value.trim());\n    if (!sql) { status.textContent = 'Enter SQL to render.'; return; }\n    status.textContent = 'Rendering...';\n    frame.src = '/vega?sql=' + sql;\n    frame.onload = function(){ status.textContent = ''; };\n  });\n})();\n</script>\n""".encode()
+
+
+def _inject_vega_panel(resp):
+	# Static files, redirects and JSON API responses are left alone without touching the body
+	if resp.direct_passthrough or resp.status_code != 200 or request.path != "/":
+		return resp
+	try:
+		if "text/html" not in resp.headers.get("Content-Type", ""):
+			return resp
+		body = resp.get_data()
+		end = body.rfind(b"</body>")
+		if end != -1 and b"VEGA_PANEL_INJECTED" not in body:
+			resp.set_data(body[:end] + _VEGA_INJECTION_BYTES + body[end:])
+	except Exception:
+		pass
+	return resp
+
+
 def build_app():
+	from vanna.flask import VannaFlaskApp
+
 	vn, _ = create_vanna_with_pg()
 	app = VannaFlaskApp(vn=vn, title="Vanna + Uber", subtitle="Ask questions about Uber bookings")
 
@@ -184,17 +361,12 @@ def build_app():
 		x_field = cols[0]
 		y_field = cols[1] if len(cols) > 1 else cols[0]
 
-		# Decide y encoding: numeric -> quantitative, else aggregate count
-		is_y_numeric = False
-		try:
-			is_y_numeric = pd.api.types.is_numeric_dtype(df[y_field])
-		except Exception:
-			is_y_numeric = False
+		# Decide y encoding: numeric -> quantitative, else aggregate count.
+		# Positional dtype kind (bool/int/uint/float/complex) also works with duplicate column names
+		is_y_numeric = df.dtypes.iloc[1 if len(cols) > 1 else 0].kind in "biufc"
 
-		values = df.to_dict(orient="records")
 		spec = {
 			"$schema": "https://vega.github.io/schema/vega-lite/v5.json",
-			"data": {"values": values},
 			"mark": "bar",
 			"encoding": {
 				"x": {"field": x_field, "type": "nominal"},
@@ -206,47 +378,15 @@ def build_app():
 			}
 		}
 
-		html = f"""<!doctype html>
-<html>
-<head>
-<meta charset=\"utf-8\">
-<title>Vega-Lite</title>
-<script src=\"https://cdn.jsdelivr.net/npm/vega@5\"></script>
-<script src=\"https://cdn.jsdelivr.net/npm/vega-lite@5\"></script>
-<script src=\"https://cdn.jsdelivr.net/npm/vega-embed@6\"></script>
-<style>
-  body {{ font-family: system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; }}
-  #vis {{ max-width: 1000px; }}
-  pre {{ white-space: pre-wrap; word-break: break-word; }}
-  a {{ color: #0b5fff; }}
-</style>
-</head>
-<body>
-<h3>Vega-Lite Chart</h3>
-<div style=\"margin-bottom:12px\">SQL: <code>{sql}</code></div>
-<div id=\"vis\"></div>
-<script>
-const spec = {json.dumps(spec, default=str)};
-vegaEmbed('#vis', spec).catch(console.error);
-</script>
-<div style=\"margin-top:16px\"><a href=\"/\">Back to Vanna</a></div>
-</body>
-</html>"""
-		return html
+		# pandas serializes the rows in C (ISO dates, escaped '/'), so splice that JSON
+		# into the spec instead of boxing every cell through to_dict + json.dumps;
+		# default_handler=str renders UUIDs and other objects the encoder can't, as before
+		values_json = df.to_json(orient="records", date_format="iso", default_handler=str)
+		spec_json = json.dumps(spec)[:-1] + ', "data": {"values": ' + values_json + "}}"
 
-	# Inject an in-page Vega-Lite panel into the main UI without changing templates
-	def _inject_vega_panel(resp):
-		try:
-			ct = resp.headers.get("Content-Type", "")
-			if request.path == "/" and "text/html" in ct:
-				html = resp.get_data(as_text=True)
-				if "VEGA_PANEL_INJECTED" not in html and "</body>" in html:
-					injection = """\n<!-- VEGA_PANEL_INJECTED -->\n<div id=\"vega-lite-panel\" style=\"position:fixed; right:16px; bottom:16px; width:520px; max-width:92vw; height:420px; background:#fff; border:1px solid #e3e3e3; box-shadow:0 6px 24px rgba(0,0,0,0.12); border-radius:8px; z-index:9999; display:flex; flex-direction:column;\">\n  <div style=\"display:flex; align-items:center; justify-content:space-between; padding:10px 12px; border-bottom:1px solid #eee; background:#fafafa; border-top-left-radius:8px; border-top-right-radius:8px;\">\n    <div style=\"font-weight:600; font-size:14px;\">Vega-Lite Chart</div>\n    <button id=\"vega-panel-toggle\" style=\"background:none; border:none; cursor:pointer; font-size:13px; color:#0b5fff;\">Hide</button>\n  </div>\n  <div id=\"vega-panel-body\" style=\"display:flex; flex-direction:column; gap:8px; padding:10px 12px;\">\n    <div style=\"font-size:12px; color:#333;\">Enter SQL to visualize (first column on X, second numeric column on Y; otherwise counts):</div>\n    <textarea id=\"vega-sql\" style=\"width:100%; height:80px; font-family:ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, \u0027Liberation Mono\u0027, \u0027Courier New\u0027, monospace; font-size:12px; padding:8px; border:1px solid #ddd; border-radius:6px;\" placeholder=\"SELECT vehicle_type, COUNT(*) AS rides FROM uber_bookings GROUP BY 1 ORDER BY 2 DESC LIMIT 10\"></textarea>\n    <div style=\"display:flex; gap:8px; align-items:center;\">\n      <button id=\"vega-render\" style=\"background:#0b5fff; color:#fff; border:none; padding:8px 12px; border-radius:6px; cursor:pointer; font-size:12px;\">Render</button>\n      <span id=\"vega-status\" style=\"font-size:12px; color:#666;\"></span>\n    </div>\n    <iframe id=\"vega-frame\" title=\"Vega-Lite\" style=\"flex:1; width:100%; border:1px solid #eee; border-radius:6px; background:#fff;\"></iframe>\n  </div>\n</div>\n<script>\n(function(){\n  const panel = document.getElementById('vega-lite-panel');\n  const body = document.getElementById('vega-panel-body');\n  const toggle = document.getElementById('vega-panel-toggle');\n  const btn = document.getElementById('vega-render');\n  const ta = document.getElementById('vega-sql');\n  const frame = document.getElementById('vega-frame');\n  const status = document.getElementById('vega-status');\n  if (!panel || !btn || !ta || !frame) return;\n  toggle.addEventListener('click', function(){\n    const isHidden = body.style.display === 'none';\n    body.style.display = isHidden ? 'flex' : 'none';\n    toggle.textContent = isHidden ? 'Hide' : 'Show';\n  });\n  btn.addEventListener('click', function(){\n    const sql = encodeURIComponent(ta.value.trim());\n    if (!sql) { status.textContent = 'Enter SQL to render.'; return; }\n    status.textContent = 'Rendering...';\n    frame.src = '/vega?sql=' + sql;\n    frame.onload = function(){ status.textContent = ''; };\n  });\n})();\n</script>\n"""
-					html = html.replace("</body>", injection + "</body>")
-					resp.set_data(html)
-		except Exception:
-			pass
-		return resp
+		# Only the SQL and the spec vary; the page around them is prebuilt bytes
+		spec_json = spec_json.replace("</", "<\\/")
+		return _VEGA_HEAD + escape(sql).encode() + _VEGA_MID + spec_json.encode() + _VEGA_TAIL
 
 	# Register handlers if Flask app is available; otherwise skip gracefully
 	if flask_app is not None:
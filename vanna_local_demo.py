@@ -1,4 +1,9 @@
 import os
+import re
+import json
+import atexit
+import hashlib
+import asyncio
 import pandas as pd
 from dotenv import load_dotenv
 
@@ -6,10 +11,94 @@ from vanna.chromadb import ChromaDB_VectorStore
 from vanna.google import GoogleGeminiChat
 from sqlalchemy import create_engine, text
 
+from _vanna_common import TRAINING_EXAMPLES, build_view_ddl, pick_uber_table, to_snake_case
+
+
+# SQL that ran successfully is remembered across runs, keyed on the normalized question. The file
+# also stores a signature of the table, view DDL, training set and model; any change starts it afresh
+SQL_CACHE_PATH = os.path.expanduser(os.getenv("VANNA_SQL_CACHE", "~/.cache/vanna_sql.json"))
+SQL_CACHE_SIZE = 256
+
+
+def training_signature(*parts) -> str:
+	return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def open_sql_cache(signature: str) -> dict:
+	try:
+		with open(SQL_CACHE_PATH, encoding="utf-8") as f:
+			data = json.load(f)
+	except (OSError, ValueError):
+		data = {}
+	cache = dict(data.get("entries", {})) if isinstance(data, dict) and data.get("signature") == signature else {}
+
+	def save():
+		try:
+			os.makedirs(os.path.dirname(SQL_CACHE_PATH), exist_ok=True)
+			with open(SQL_CACHE_PATH, "w", encoding="utf-8") as f:
+				# Dicts keep insertion order, so this keeps the most recently added entries
+				json.dump({"signature": signature, "entries": dict(list(cache.items())[-SQL_CACHE_SIZE:])}, f)
+		except OSError:
+			pass
+
+	atexit.register(save)
+	return cache
+
+
+def sql_cache_key(question: str) -> str:
+	return " ".join(question.lower().split())
+
+
+# Enhanced normalization: convert common SQLite date funcs to Postgres in one pass,
+# e.g. DATE('now') -> CURRENT_DATE, date('now', '-7 days') -> CURRENT_DATE - INTERVAL '7 days'
+_PG_NORM = re.compile(r"\b(DATE|DATETIME)\('now'(?:,\s*'-(\d+)\s*(days?)')?\)", re.IGNORECASE)
+
+
+def _pg_date_repl(m: re.Match) -> str:
+	base = "NOW()" if m.group(1).lower() == "datetime" else "CURRENT_DATE"
+	if m.group(2) is None:
+		return base
+	return f"{base} - INTERVAL '{m.group(2)} {m.group(3).lower()}'"
+
+
+def normalize_sql_for_postgres(s: str) -> str:
+	return _PG_NORM.sub(_pg_date_repl, s)
+
+
+# Concurrent Gemini requests per run, to stay well inside the API rate limit
+QUESTION_CONCURRENCY = 5
+
+
+# Returns (sql, df, error) per question, in input order
+async def ask_all(vn, questions: list[str], sql_cache: dict) -> list[tuple]:
+	loop = asyncio.get_running_loop()
+	limit = asyncio.Semaphore(QUESTION_CONCURRENCY)
+
+	async def ask(question: str):
+		async with limit:
+			key = sql_cache_key(question)
+			sql = sql_cache.get(key)
+			if sql is None:
+				# Get SQL only to avoid any automatic execution
+				sql = await loop.run_in_executor(None, vn.generate_sql, question)
+				if not sql:
+					return sql, None, None
+				sql = normalize_sql_for_postgres(sql)
+			try:
+				df = await loop.run_in_executor(None, vn.run_sql, sql)
+			except Exception as e:
+				sql_cache.pop(key, None)
+				return sql, None, e
+			# Only SQL that actually ran is replayed on later runs
+			sql_cache[key] = sql
+			return sql, df, None
+
+	return await asyncio.gather(*(ask(q) for q in questions))
+
 
 class MyVanna(ChromaDB_VectorStore, GoogleGeminiChat):
 	def __init__(self, api_key: str, model: str):
-		ChromaDB_VectorStore.__init__(self, config={})
+		ChromaDB_VectorStore.__init__(self, config={"path": os.getenv("CHROMA_PATH", ".")})
 		GoogleGeminiChat.__init__(self, config={"api_key": api_key, "model": model})
 
 
@@ -44,16 +133,7 @@ def main():
 			WHERE table_schema='public' AND table_type='BASE TABLE'
 		"""))
 		available = {row[0] for row in result.fetchall()}
-		if preferred and preferred in available:
-			target_table = preferred
-		elif "ncr_ride_bookings" in available:
-			target_table = "ncr_ride_bookings"
-		elif "uber_rides" in available:
-			target_table = "uber_rides"
-		else:
-			# Fallback: first table containing 'ride' or 'uber'
-			match = [t for t in available if ("ride" in t.lower() or "uber" in t.lower())]
-			target_table = match[0] if match else None
+		target_table = pick_uber_table(available, preferred)
 
 		if not target_table:
 			raise ValueError("No Uber-related table found. Set DATA_TABLE env var to your table name.")
@@ -70,13 +150,6 @@ def main():
 			"""
 		), {"t": target_table}).fetchall()
 
-		def to_snake_case(name: str) -> str:
-			import re
-			s = name.strip().lower()
-			s = re.sub(r"[^a-z0-9]+", "_", s)
-			s = re.sub(r"_+", "_", s).strip("_")
-			return s or "col"
-
 		select_list = []
 		snake_columns = []
 		for (col_name,) in cols:
@@ -108,58 +181,17 @@ def main():
 			ORDER BY ordinal_position
 			"""
 		), {"v": "uber_bookings"}).fetchall()
-		ddl_lines = []
-		for col_name, data_type in ddl_cols:
-			mapped = "text"
-			if "double" in data_type or data_type in ("numeric", "real"):
-				mapped = "double precision"
-			elif data_type in ("integer", "bigint", "smallint"):
-				mapped = "integer"
-			elif "timestamp" in data_type or data_type == "date":
-				mapped = data_type
-			ddl_lines.append(f"\t\t{col_name} {mapped}")
-		ddl_sql = "CREATE TABLE uber_bookings (\n" + ",\n".join(ddl_lines) + "\n\t)"
+		ddl_sql = build_view_ddl(ddl_cols)
 		vn.train(ddl=ddl_sql)
 
 	# Documentation and Uber-specific examples
-	vn.train(documentation=(
+	documentation = (
 		"Uber bookings dataset: Each row is a ride booking with timestamps, status, locations, ride distance, booking value, ratings, and payment method."
-	))
-
-	vn.train(
-		question="How many total rides are there?",
-		sql="SELECT COUNT(*) AS total_rides FROM uber_bookings;"
 	)
+	vn.train(documentation=documentation)
 
-	vn.train(
-		question="How many completed rides by day?",
-		sql=(
-			"SELECT date::date AS ride_date, COUNT(*) AS completed_rides "
-			"FROM uber_bookings WHERE lower(booking_status) = 'completed' "
-			"GROUP BY date::date ORDER BY ride_date;"
-		)
-	)
-
-	vn.train(
-		question="What is the average ride distance per vehicle type?",
-		sql=(
-			"SELECT vehicle_type, AVG(ride_distance) AS avg_distance "
-			"FROM uber_bookings GROUP BY vehicle_type ORDER BY avg_distance DESC;"
-		)
-	)
-
-	vn.train(
-		question="Top 10 pickup locations by rides",
-		sql=(
-			"SELECT pickup_location, COUNT(*) AS rides "
-			"FROM uber_bookings GROUP BY pickup_location ORDER BY rides DESC LIMIT 10;"
-		)
-	)
-
-	vn.train(
-		question="Total booking value (revenue)?",
-		sql="SELECT SUM(booking_value) AS total_booking_value FROM uber_bookings;"
-	)
+	for example in TRAINING_EXAMPLES:
+		vn.train(**example)
 
 	# Show available tables
 	print("\n" + "="*60)
@@ -202,42 +234,22 @@ def main():
 		"Total booking value (revenue)?"
 	]
 
-	for i, question in enumerate(test_questions, 1):
+	# Questions are independent: generate and run them concurrently, then report in order
+	sql_cache = open_sql_cache(training_signature(target_table, ddl_sql, documentation, TRAINING_EXAMPLES, gemini_model))
+	results = asyncio.run(ask_all(vn, test_questions, sql_cache))
+
+	for i, (question, (sql, df, error)) in enumerate(zip(test_questions, results), 1):
 		print(f"\n" + "="*60)
 		print(f"🤖 TEST {i}: {question}")
 		print("="*60)
-		
-		# Get SQL only to avoid any automatic execution
-		sql = vn.generate_sql(question)
-		df = None
 
 		if sql:
-			# Enhanced normalization: convert common SQLite date funcs to Postgres
-			def normalize_sql_for_postgres(s: str) -> str:
-				replacements = [
-					("DATE('now', '-7 days')", "CURRENT_DATE - INTERVAL '7 days'"),
-					("DATE('now', '-6 days')", "CURRENT_DATE - INTERVAL '6 days'"),
-					("DATE('now', '-1 day')", "CURRENT_DATE - INTERVAL '1 day'"),
-					("DATE('now')", "CURRENT_DATE"),
-					("date('now', '-7 days')", "CURRENT_DATE - INTERVAL '7 days'"),
-					("date('now', '-6 days')", "CURRENT_DATE - INTERVAL '6 days'"),
-					("date('now', '-1 day')", "CURRENT_DATE - INTERVAL '1 day'"),
-					("date('now')", "CURRENT_DATE"),
-					("datetime('now')", "NOW()"),
-			]
-				for old, new in replacements:
-					s = s.replace(old, new)
-				return s
-
-			sql = normalize_sql_for_postgres(sql)
 			print(f"\n🔍 Generated SQL:\n{sql}")
-			if df is None:
-				try:
-					df = vn.run_sql(sql)
-					print(f"\n📊 Query Results ({len(df)} rows):")
-					print(df.to_string(index=False))
-				except Exception as e:
-					print(f"\n❌ Failed to run generated SQL: {e}")
+			if error is None:
+				print(f"\n📊 Query Results ({len(df)} rows):")
+				print(df.to_string(index=False))
+			else:
+				print(f"\n❌ Failed to run generated SQL: {error}")
 		else:
 			print("❌ Could not generate a SQL query for the question.")
 